@@ -3,16 +3,40 @@
 __version__ = "0.1.0"
 __author__ = "Saurabh Yergattikar"
 
-from .cli import app
-from .scanner.scanner import Scanner, APICall
-from .analyzer.cost_analyzer import CostAnalyzer
-from .migrator.basic_migrator import BasicMigrator, MigrationResult
-
-__all__ = [
-    "app",
-    "Scanner",
-    "APICall", 
-    "CostAnalyzer",
-    "BasicMigrator",
-    "MigrationResult",
-] 
\ No newline at end of file
+# Re-exports are resolved lazily (PEP 562) so that importing the package
+# (e.g. for the CLI entry point) doesn't pull in heavy optional stacks
+# like openai_harmony and the Ollama client until they are actually used.
+_EXPORTS = {
+    "app": ("gpt_migrator.cli", "app"),
+    "Scanner": ("gpt_migrator.scanner.scanner", "Scanner"),
+    "APICall": ("gpt_migrator.scanner.scanner", "APICall"),
+    "CostAnalyzer": ("gpt_migrator.analyzer.cost_analyzer", "CostAnalyzer"),
+    "BasicMigrator": ("gpt_migrator.migrator.basic_migrator", "BasicMigrator"),
+    "MigrationResult": ("gpt_migrator.migrator.basic_migrator", "MigrationResult"),
+    "ChatService": ("gpt_migrator.chat.chat_service", "ChatService"),
+    "HarmonyBuilder": ("gpt_migrator.harmony.harmony_builder", "HarmonyBuilder"),
+    "Config": ("gpt_migrator.core.config", "Config"),
+    "ScanResult": ("gpt_migrator.core.models", "ScanResult"),
+    "MigrationReport": ("gpt_migrator.core.models", "MigrationReport"),
+    "LocalInference": ("gpt_migrator.inference.inference", "LocalInference"),
+    "ToolRegistry": ("gpt_migrator.tools.registry", "ToolRegistry"),
+    "AsyncLocalInference": ("gpt_migrator.inference.inference", "AsyncLocalInference"),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value  # cache for subsequent lookups
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,9 @@
 """Cost analyzer for OpenAI API calls."""
 
+from collections import Counter, defaultdict
 from typing import Dict, List, Optional
 
+import orjson
 from pydantic import BaseModel
 
 from ..scanner.scanner import APICall
@@ -34,57 +36,80 @@ class CostAnalyzer:
         "completion": 250,
         "embedding": 1000,
     }
+
+    # Fallback cost per 1K tokens by call type when the model is unknown
+    _TYPE_DEFAULT_CPK = {
+        "chat": 0.0015,  # gpt-3.5-turbo
+        "completion": 0.02,  # text-davinci-003
+        "embedding": 0.0001,  # text-embedding-ada-002
+    }
+
+    # Token multipliers by call complexity (simple omitted -> 1.0)
+    _COMPLEXITY_MULT = {
+        "complex": 2.0,
+        "medium": 1.5,
+    }
+
+    # Per-token variants with the /1000 folded in, so the per-call cost is
+    # a single multiply instead of a divide and a multiply
+    _COST_PER_TOKEN = {model: cpk / 1000 for model, cpk in COST_PER_1K_TOKENS.items()}
+    _TYPE_DEFAULT_CPT = {t: cpk / 1000 for t, cpk in _TYPE_DEFAULT_CPK.items()}
     
     def __init__(self):
         self.total_cost = 0.0
-        self.breakdown = {}
-        self.call_counts = {}
+        self.breakdown = defaultdict(float)
+        self.call_counts = Counter()
     
-    def analyze_calls(self, api_calls: List[APICall]) -> CostEstimate:
-        """Analyze API calls and estimate costs."""
-        for call in api_calls:
-            cost = self._estimate_call_cost(call)
-            
-            # Update totals
-            self.total_cost += cost
-            self.breakdown[call.type] = self.breakdown.get(call.type, 0) + cost
-            self.call_counts[call.type] = self.call_counts.get(call.type, 0) + 1
-        
+    def ingest(self, call: APICall) -> None:
+        """Fold a single API call into the running totals.
+
+        Lets callers stream calls straight from ``Scanner.iter_calls``
+        without materializing the full list first.
+        """
+        cost = self._estimate_call_cost(call)
+        self.total_cost += cost
+        self.breakdown[call.type] += cost
+        self.call_counts[call.type] += 1
+
+    def finalize(self) -> CostEstimate:
+        """Build the cost estimate from everything ingested so far."""
         # Estimate potential savings (assume 80% cost reduction)
         potential_savings = self.total_cost * 0.8
-        
+
         return CostEstimate(
             monthly_cost=self.total_cost,
             potential_savings=potential_savings,
-            breakdown=self.breakdown,
-            call_counts=self.call_counts
+            breakdown=dict(self.breakdown),
+            call_counts=dict(self.call_counts)
         )
+
+    def analyze_calls(self, api_calls: List[APICall]) -> CostEstimate:
+        """Analyze API calls and estimate costs."""
+        # Single tight pass with the method lookup hoisted into a local.
+        ingest = self.ingest
+        for call in api_calls:
+            ingest(call)
+        return self.finalize()
     
     def _estimate_call_cost(self, call: APICall) -> float:
         """Estimate cost for a single API call."""
-        # Get token estimate
+        # Get token estimate, adjusted for complexity
         tokens = call.estimated_tokens or self.DEFAULT_TOKENS.get(call.type, 500)
-        
-        # Adjust tokens based on complexity
-        if call.complexity == "complex":
-            tokens *= 2
-        elif call.complexity == "medium":
-            tokens *= 1.5
-        
-        # Get cost per 1K tokens
-        if call.model:
-            cost_per_1k = self.COST_PER_1K_TOKENS.get(call.model)
-        else:
-            # Default costs if model not specified
-            cost_per_1k = {
-                "chat": 0.0015,  # gpt-3.5-turbo
-                "completion": 0.02,  # text-davinci-003
-                "embedding": 0.0001,  # text-embedding-ada-002
-            }.get(call.type, 0.0015)
-        
+        tokens *= self._COMPLEXITY_MULT.get(call.complexity, 1.0)
+
+        # Get cost per token, falling back to the per-type default
+        cost_per_token = self._COST_PER_TOKEN.get(call.model) if call.model else None
+        if cost_per_token is None:
+            cost_per_token = self._TYPE_DEFAULT_CPT.get(call.type, 0.0000015)
+
         # Calculate cost
-        return (tokens / 1000) * cost_per_1k
+        return tokens * cost_per_token
     
+    @staticmethod
+    def to_json(estimate: CostEstimate) -> bytes:
+        """Serialize a cost estimate to JSON bytes."""
+        return orjson.dumps(estimate.model_dump(), option=orjson.OPT_INDENT_2)
+
     def generate_report(self, estimate: CostEstimate) -> str:
         """Generate a human-readable cost report."""
         report = [
@@ -0,0 +1,3 @@
+"""Chat module for talking to migrated local models."""
+
+from .chat_service import ChatService
@@ -0,0 +1,337 @@
+"""High-level chat flows backed by a local GPT-OSS model.
+
+Each public method renders a Harmony conversation, runs it through local
+inference, and returns the text of the model's ``final`` channel message.
+The ``*_async`` variants plus :meth:`ChatService.batch` let callers process
+many messages concurrently; throughput then scales with the Ollama server's
+``OLLAMA_NUM_PARALLEL`` setting instead of one request in flight at a time.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import orjson
+
+from openai_harmony import (
+    Author,
+    Conversation,
+    DeveloperContent,
+    HarmonyEncodingName,
+    Message,
+    ReasoningEffort,
+    Role,
+    SystemContent,
+    load_harmony_encoding,
+)
+
+from ..inference.inference import AsyncLocalInference, LocalInference
+
+
+#: Fixed developer instructions for each chat flow.
+HELPFUL_INSTRUCTIONS = "You are a helpful assistant."
+CREATIVE_INSTRUCTIONS = (
+    "You are a creative writing assistant. Write vivid, original prose."
+)
+CODE_INSTRUCTIONS = (
+    "You are a coding assistant. Answer with working code and short explanations."
+)
+
+
+class ChatService:
+    """Chat service for common conversation patterns."""
+
+    def __init__(self, model: str = "gpt-oss-20b", host: Optional[str] = None):
+        self.encoding = load_harmony_encoding(HarmonyEncodingName.HARMONY_GPT_OSS)
+        self.inference = LocalInference(model=model, host=host)
+        self.async_inference = AsyncLocalInference(model=model, host=host)
+        # The system/developer contents are identical for every request of a
+        # given flow, so build each message once instead of re-running the
+        # builder chain on the hot per-request path.
+        self._system_messages = {
+            effort: Message.from_role_and_content(
+                Role.SYSTEM, SystemContent.new().with_reasoning_effort(effort)
+            )
+            for effort in (
+                ReasoningEffort.LOW,
+                ReasoningEffort.MEDIUM,
+                ReasoningEffort.HIGH,
+            )
+        }
+        self._developer_messages = {
+            instructions: Message.from_role_and_content(
+                Role.DEVELOPER, DeveloperContent.new().with_instructions(instructions)
+            )
+            for instructions in (
+                HELPFUL_INSTRUCTIONS,
+                CREATIVE_INSTRUCTIONS,
+                CODE_INSTRUCTIONS,
+            )
+        }
+        # Pre-render the system+developer token prefix for each flow so each
+        # request only tokenizes the (short) user turn instead of re-rendering
+        # the full conversation.  The assistant-start suffix is the delta
+        # between a completion render and a plain render of the same prefix.
+        self._prefix_tokens = {}
+        self._assistant_start_tokens: List[int] = []
+        for effort, instructions in (
+            (ReasoningEffort.LOW, HELPFUL_INSTRUCTIONS),
+            (ReasoningEffort.HIGH, CREATIVE_INSTRUCTIONS),
+            (ReasoningEffort.MEDIUM, CODE_INSTRUCTIONS),
+        ):
+            prefix_conversation = Conversation.from_messages([
+                self._system_messages[effort],
+                self._developer_messages[instructions],
+            ])
+            prefix = self.encoding.render_conversation(prefix_conversation)
+            if not self._assistant_start_tokens:
+                full = self.encoding.render_conversation_for_completion(
+                    prefix_conversation, Role.ASSISTANT
+                )
+                self._assistant_start_tokens = full[len(prefix):]
+            self._prefix_tokens[(effort, instructions)] = prefix
+        # A rendered user turn is just the message text wrapped in fixed
+        # special tokens (<|start|>user<|message|>...<|end|>).  Capture that
+        # wrapping once with a sentinel render so per-request encoding is a
+        # single direct Rust BPE encode of the text, skipping the Message
+        # object and the Harmony formatter entirely.
+        sentinel = "\x00gpt-migrator-sentinel\x00"
+        sentinel_tokens = self.encoding.encode(sentinel)
+        rendered = self.encoding.render(
+            Message.from_role_and_content(Role.USER, sentinel)
+        )
+        start = self._find_sublist(rendered, sentinel_tokens)
+        self._user_turn_prefix = rendered[:start]
+        self._user_turn_suffix = rendered[start + len(sentinel_tokens):]
+
+    @staticmethod
+    def _find_sublist(haystack: List[int], needle: List[int]) -> int:
+        """Return the index of ``needle`` inside ``haystack``."""
+        first = needle[0]
+        span = len(needle)
+        for i in range(len(haystack) - span + 1):
+            if haystack[i] == first and haystack[i:i + span] == needle:
+                return i
+        raise ValueError("sentinel tokens not found in rendered message")
+
+    def _encode_user_turn(self, message: str) -> List[int]:
+        """Encode a user turn via the precomputed special-token wrapping."""
+        return (
+            self._user_turn_prefix
+            + self.encoding.encode(message)
+            + self._user_turn_suffix
+        )
+
+    def _build_conversation(
+        self,
+        message: str,
+        effort: ReasoningEffort,
+        instructions: str,
+    ) -> Conversation:
+        """Build a Harmony conversation for a single user message."""
+        system_message = self._system_messages[effort]
+        developer_message = self._developer_messages.get(instructions)
+        if developer_message is None:
+            developer_message = Message.from_role_and_content(
+                Role.DEVELOPER, DeveloperContent.new().with_instructions(instructions)
+            )
+        return Conversation.from_messages([
+            system_message,
+            developer_message,
+            Message.from_role_and_content(Role.USER, message),
+        ])
+
+    def _extract_final(self, parsed: List[Message]) -> str:
+        """Extract the text of the final-channel message from a response.
+
+        The model emits ``final`` last, so scan from the end.
+        """
+        msg = next((m for m in reversed(parsed) if m.channel == "final"), None)
+        return msg.content[0].text if msg is not None else ""
+
+    def _render_request(
+        self, message: str, effort: ReasoningEffort, instructions: str
+    ) -> List[int]:
+        """Render the completion tokens for a single-turn request.
+
+        Uses the cached static prefix where available so only the user turn
+        is tokenized per request; unknown flows fall back to a full render.
+        """
+        prefix = self._prefix_tokens.get((effort, instructions))
+        if prefix is None:
+            conversation = self._build_conversation(message, effort, instructions)
+            return self.encoding.render_conversation_for_completion(
+                conversation, Role.ASSISTANT
+            )
+        return prefix + self._encode_user_turn(message) + self._assistant_start_tokens
+
+    def _run(self, message: str, effort: ReasoningEffort, instructions: str) -> str:
+        """Render, run, and extract one conversation synchronously."""
+        tokens = self._render_request(message, effort, instructions)
+        parsed = self.inference.generate_with_tokens(tokens)
+        return self._extract_final(parsed)
+
+    async def _run_async(
+        self, message: str, effort: ReasoningEffort, instructions: str
+    ) -> str:
+        """Render, run, and extract one conversation asynchronously."""
+        tokens = self._render_request(message, effort, instructions)
+        parsed = await self.async_inference.generate_with_tokens(tokens)
+        return self._extract_final(parsed)
+
+    def simple_chat(self, message: str) -> str:
+        """Answer a single user message."""
+        return self._run(
+            message,
+            ReasoningEffort.LOW,
+            HELPFUL_INSTRUCTIONS,
+        )
+
+    async def simple_chat_async(self, message: str) -> str:
+        """Async variant of :meth:`simple_chat`."""
+        return await self._run_async(
+            message,
+            ReasoningEffort.LOW,
+            HELPFUL_INSTRUCTIONS,
+        )
+
+    def creative_writing(self, prompt: str) -> str:
+        """Generate creative writing for a prompt."""
+        return self._run(
+            prompt,
+            ReasoningEffort.HIGH,
+            CREATIVE_INSTRUCTIONS,
+        )
+
+    async def creative_writing_async(self, prompt: str) -> str:
+        """Async variant of :meth:`creative_writing`."""
+        return await self._run_async(
+            prompt,
+            ReasoningEffort.HIGH,
+            CREATIVE_INSTRUCTIONS,
+        )
+
+    def code_assistant(self, prompt: str) -> str:
+        """Answer a programming question."""
+        return self._run(
+            prompt,
+            ReasoningEffort.MEDIUM,
+            CODE_INSTRUCTIONS,
+        )
+
+    async def code_assistant_async(self, prompt: str) -> str:
+        """Async variant of :meth:`code_assistant`."""
+        return await self._run_async(
+            prompt,
+            ReasoningEffort.MEDIUM,
+            CODE_INSTRUCTIONS,
+        )
+
+    def run_with_tools(
+        self,
+        message: str,
+        tools: Dict[str, Callable[..., str]],
+        max_rounds: int = 4,
+    ) -> str:
+        """Answer a message, executing any requested tools between rounds.
+
+        All tool calls emitted in one round are executed concurrently, so a
+        round costs max(tool latencies) rather than their sum, and the model
+        is continued once per round instead of once per call.
+        """
+        tokens = list(
+            self._prefix_tokens[(ReasoningEffort.MEDIUM, CODE_INSTRUCTIONS)]
+        )
+        tokens += self._encode_user_turn(message)
+        for _ in range(max_rounds):
+            parsed = self.inference.generate_with_tokens(
+                tokens + self._assistant_start_tokens
+            )
+            tool_msgs = [
+                m
+                for m in parsed
+                if m.channel == "commentary" and getattr(m, "recipient", None)
+            ]
+            if not tool_msgs:
+                return self._extract_final(parsed)
+
+            with ThreadPoolExecutor(max_workers=len(tool_msgs)) as executor:
+                results = list(
+                    executor.map(
+                        lambda m: self._execute_tool(m, tools), tool_msgs
+                    )
+                )
+
+            # Append every tool call and its response, then continue once
+            for msg, result in zip(tool_msgs, results):
+                tool_name = msg.recipient
+                tokens += self.encoding.render(msg)
+                tokens += self.encoding.render(
+                    Message.from_author_and_content(
+                        Author.new(Role.TOOL, tool_name), result
+                    )
+                    .with_recipient("assistant")
+                    .with_channel("commentary")
+                )
+        return ""
+
+    @staticmethod
+    def _execute_tool(
+        msg: Message, tools: Dict[str, Callable[..., str]]
+    ) -> str:
+        """Execute one tool call message, returning its textual result."""
+        tool = tools.get(msg.recipient)
+        if tool is None:
+            return f"Unknown tool: {msg.recipient}"
+        arguments = msg.content[0].text if msg.content else ""
+        try:
+            # Tool arguments are JSON; parse once here so tools get a dict
+            arguments = orjson.loads(arguments)
+        except orjson.JSONDecodeError:
+            pass  # non-JSON payloads are handed through as raw text
+        try:
+            return str(tool(arguments))
+        except Exception as e:
+            return f"Tool error: {e}"
+
+    def start_conversation(self) -> None:
+        """Reset the incremental token history to the static prefix."""
+        self._history_tokens = list(
+            self._prefix_tokens[(ReasoningEffort.LOW, HELPFUL_INSTRUCTIONS)]
+        )
+
+    def chat_turn(self, message: str, reset: bool = False) -> str:
+        """Run one conversation turn against the incremental token history.
+
+        Only the new user turn and the assistant reply are tokenized per
+        turn; the rendered history is kept as a token buffer, so an N-turn
+        dialogue costs O(N) tokenization instead of re-rendering the whole
+        conversation (O(N^2)) every turn.
+        """
+        if reset or not hasattr(self, "_history_tokens"):
+            self.start_conversation()
+        self._history_tokens += self._encode_user_turn(message)
+        tokens = self._history_tokens + self._assistant_start_tokens
+        parsed = self.inference.generate_with_tokens(tokens)
+        reply = self._extract_final(parsed)
+        self._history_tokens += self.encoding.render(
+            Message.from_role_and_content(Role.ASSISTANT, reply).with_channel("final")
+        )
+        return reply
+
+    def multi_turn_conversation(self, messages: List[str]) -> List[str]:
+        """Run a multi-turn conversation, returning the reply to each turn."""
+        replies = []
+        for i, message in enumerate(messages):
+            replies.append(self.chat_turn(message, reset=(i == 0)))
+        return replies
+
+    async def batch_async(self, messages: List[str]) -> List[str]:
+        """Answer many independent messages concurrently."""
+        return await asyncio.gather(
+            *[self.simple_chat_async(message) for message in messages]
+        )
+
+    def batch(self, messages: List[str]) -> List[str]:
+        """Sync entrypoint for :meth:`batch_async`."""
+        return asyncio.run(self.batch_async(messages))
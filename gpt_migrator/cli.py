@@ -1,56 +1,116 @@
 """Command-line interface for HarmonyMigrator."""
 
+from os.path import basename as _basename
 from pathlib import Path
 from typing import Optional
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from .analyzer.cost_analyzer import CostAnalyzer
-from .migrator.basic_migrator import BasicMigrator
-from .scanner.scanner import Scanner
+# rich and the feature modules are imported lazily inside each command so
+# that `gpt-migrator --help` (and shell completion) don't pay their cost.
 
 app = typer.Typer(help="Migrate OpenAI API calls to local models")
-console = Console()
+
+
+_console_instance = None
+_table_cls = None
+
+
+def _get_table():
+    """Resolve rich's Table lazily, once per process."""
+    global _table_cls
+    if _table_cls is None:
+        from rich.table import Table
+
+        _table_cls = Table
+    return _table_cls
+
+
+def _console():
+    """Build the rich console on first use and reuse it afterwards."""
+    global _console_instance
+    if _console_instance is None:
+        from rich.console import Console
+
+        _console_instance = Console()
+    return _console_instance
+
+
+@app.command()
+def version():
+    """Show the installed gpt-migrator version."""
+    from . import __version__
+
+    typer.echo(f"gpt-migrator {__version__}")
 
 
 @app.command()
 def scan(
     path: str = typer.Argument(..., help="Path to scan for OpenAI API calls"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed output"),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Write scan results to a JSON file"
+    ),
 ):
     """Scan codebase for OpenAI API calls."""
+    from .scanner.scanner import Scanner
+
+    console = _console()
     console.print(f"🔍 Scanning: {path}")
-    
+
     scanner = Scanner()
-    api_calls = scanner.scan_directory(path)
-    
-    if not api_calls:
-        console.print("✨ No OpenAI API calls found!")
-        return
-    
-    # Create results table
-    table = Table(title="📊 OpenAI API Calls Found")
+
+    # Create results table, streaming rows as files are scanned
+    table = _get_table()(title="📊 OpenAI API Calls Found")
     table.add_column("File", style="cyan")
     table.add_column("Line", style="magenta")
     table.add_column("Type", style="green")
     table.add_column("Complexity", style="yellow")
-    
-    for call in api_calls:
+
+    # Stream JSON output call-by-call so large scans never hold the full
+    # result (or an intermediate dict tree) in memory.
+    out_f = None
+    out_count = 0
+    if output:
+        import orjson
+
+        out_f = open(output, 'wb')
+        out_f.write(b'{"calls": [')
+
+    verbose_calls = []
+    found = False
+    for call in scanner.iter_calls(path):
+        found = True
+        if out_f is not None:
+            if out_count:
+                out_f.write(b',')
+            out_f.write(orjson.dumps(call.to_dict()))
+            out_count += 1
         table.add_row(
-            Path(call.file).name,
+            _basename(call.file),
             str(call.line),
             call.type,
             call.complexity
         )
-    
+        if verbose:
+            verbose_calls.append(call)
+
+    if out_f is not None:
+        out_f.write(b'], "api_calls_found": %d}' % out_count)
+        out_f.close()
+
+    if not found:
+        console.print("✨ No OpenAI API calls found!")
+        return
+
     console.print(table)
-    
-    if verbose:
-        for call in api_calls:
-            console.print(f"\n[cyan]Details for {call.file}:{call.line}[/cyan]")
-            console.print(call.to_dict())
+
+    for call in verbose_calls:
+        console.print(f"\n[cyan]Details for {call.file}:{call.line}[/cyan]")
+        console.print(call.to_dict())
+
+    if output:
+        console.print(f"\n✅ Results written to: {output}")
 
 
 @app.command()
@@ -59,27 +119,35 @@ def analyze(
     export: Optional[str] = typer.Option(None, "--export", "-e", help="Export results to file"),
 ):
     """Analyze OpenAI API costs."""
+    from .analyzer.cost_analyzer import CostAnalyzer
+    from .scanner.scanner import Scanner
+
+    console = _console()
     console.print(f"💰 Analyzing costs for: {path}")
-    
-    # Scan for API calls
+
+    # Stream API calls straight into the analyzer in a single pass
     scanner = Scanner()
-    api_calls = scanner.scan_directory(path)
-    
-    if not api_calls:
+    analyzer = CostAnalyzer()
+    for call in scanner.iter_calls(path):
+        analyzer.ingest(call)
+
+    if not analyzer.call_counts:
         console.print("✨ No OpenAI API calls found!")
         return
-    
-    # Analyze costs
-    analyzer = CostAnalyzer()
-    estimate = analyzer.analyze_calls(api_calls)
-    
+
+    estimate = analyzer.finalize()
+
     # Generate report
     report = analyzer.generate_report(estimate)
     console.print(report)
     
     if export:
-        with open(export, 'w') as f:
-            f.write(report)
+        if export.endswith('.json'):
+            with open(export, 'wb') as f:
+                f.write(CostAnalyzer.to_json(estimate))
+        else:
+            with open(export, 'w') as f:
+                f.write(report)
         console.print(f"\n✅ Report exported to: {export}")
 
 
@@ -90,6 +158,9 @@ def migrate(
     dry_run: bool = typer.Option(True, help="Show changes without applying"),
 ):
     """Migrate OpenAI API calls to local models."""
+    from .migrator.basic_migrator import BasicMigrator
+
+    console = _console()
     console.print(f"🔄 Migrating: {path}")
     
     # Read the file
@@ -146,5 +217,148 @@ def migrate(
         console.print(f"📝 Original file updated: {path}")
 
 
+def print_conversion_summary(console, results):
+    """Print a summary table for a batch of conversion results."""
+    table = _get_table()(title="🔄 Conversion Summary")
+    table.add_column("File", style="cyan")
+    table.add_column("Line", style="magenta")
+    table.add_column("Type", style="green")
+    table.add_column("Status", style="yellow")
+
+    # Single pass: count successes while emitting rows
+    total = len(results)
+    successful = 0
+    for result in results:
+        successful += result.success
+        table.add_row(
+            _basename(result.file),
+            str(result.line),
+            result.call_type,
+            "✅" if result.success else "❌",
+        )
+
+    console.print(table)
+    console.print(
+        f"\n✅ {successful} converted, ❌ {total - successful} unsupported"
+    )
+
+
+@app.command()
+def convert(
+    path: str = typer.Argument(..., help="Path to convert"),
+    model: str = typer.Option("gpt-oss-20b", help="Target local model"),
+    backend: str = typer.Option("ollama", help="Target inference backend"),
+    output: Optional[str] = typer.Option(
+        None, "--output", "-o", help="Write converted snippets to a JSON file"
+    ),
+):
+    """Convert detected OpenAI API calls into Harmony replacement code."""
+    from .converter.converter import (
+        Converter,
+        ConverterConfig,
+        TargetBackend,
+        TargetModel,
+    )
+    from .scanner.scanner import Scanner
+
+    console = _console()
+    console.print(f"🔄 Converting: {path}")
+
+    calls = Scanner().scan_directory(path)
+    if not calls:
+        console.print("✨ No OpenAI API calls found!")
+        return
+
+    converter = Converter(ConverterConfig(
+        model=TargetModel(model),
+        backend=TargetBackend(backend),
+    ))
+
+    if output and output.endswith('.jsonl'):
+        # Stream results to disk as JSON lines; memory stays flat no matter
+        # how many calls the repo contains
+        import orjson
+
+        with open(output, 'wb') as f:
+            summary = converter.convert_calls(
+                calls,
+                sink=lambda r: f.write(orjson.dumps(r.model_dump()) + b'\n'),
+            )
+        console.print(
+            f"✅ {summary.converted} converted, "
+            f"❌ {summary.unsupported} unsupported"
+        )
+        console.print(f"✅ Conversions written to: {output}")
+        return
+
+    if console.is_terminal:
+        from rich.progress import Progress
+
+        # Descriptions are precomputed so the per-call callback does one
+        # next() instead of attribute chains and an f-string per call
+        descriptions = iter(
+            f"Converting {_basename(c.file)}:{c.line}" for c in calls
+        )
+        with Progress(console=console) as progress:
+            task = progress.add_task("Converting...", total=len(calls))
+            results = converter.convert_calls(
+                calls,
+                progress_callback=lambda: progress.update(
+                    task, advance=1, description=next(descriptions)
+                ),
+            )
+    else:
+        # Piped/CI output: skip the progress machinery (render thread,
+        # ANSI control sequences, per-call re-renders) entirely
+        results = converter.convert_calls(calls)
+
+    print_conversion_summary(console, results)
+
+    if output:
+        import orjson
+
+        with open(output, 'wb') as f:
+            f.write(orjson.dumps(
+                [r.model_dump() for r in results], option=orjson.OPT_INDENT_2
+            ))
+        console.print(f"\n✅ Conversions written to: {output}")
+
+
+@app.command()
+def migrate_all(
+    root: str = typer.Argument(..., help="Directory to migrate"),
+    pattern: str = typer.Option("*.py", help="Glob pattern of files to migrate"),
+):
+    """Preview migrations for every matching file under a directory."""
+    import glob
+    import os
+
+    from .migrator.basic_migrator import BasicMigrator
+
+    console = _console()
+    console.print(f"🔄 Migrating all files under: {root}")
+
+    paths = [
+        p
+        for p in glob.iglob(os.path.join(root, "**", pattern), recursive=True)
+        if os.path.isfile(p)
+    ]
+
+    # One migrator instance for the whole batch
+    migrator = BasicMigrator()
+    results = migrator.migrate_paths(paths)
+
+    if not results:
+        console.print("✨ No migratable files found!")
+        return
+
+    for file_path, result in results.items():
+        console.print(f"\n[cyan]{file_path}[/cyan]")
+        for change in result.changes_made:
+            console.print(f"✅ {change}")
+
+    console.print(f"\n📝 {len(results)} file(s) can be migrated (dry run)")
+
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -0,0 +1,10 @@
+"""Converter module for generating Harmony replacement code."""
+
+from .converter import (
+    ConversionResult,
+    ConversionSummary,
+    Converter,
+    ConverterConfig,
+    TargetBackend,
+    TargetModel,
+)
@@ -0,0 +1,330 @@
+"""Converter for turning detected OpenAI API calls into Harmony code."""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from os.path import basename as _basename
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ..scanner.scanner import APICall
+
+_NL = "\n"
+
+# Static blocks of the generated snippet, built once at import time
+_IMPORTS_BLOCK = '''from openai_harmony import (
+    Conversation,
+    DeveloperContent,
+    HarmonyEncodingName,
+    Message,
+    ReasoningEffort,
+    Role,
+    SystemContent,
+    load_harmony_encoding,
+)
+
+from gpt_migrator.inference import LocalInference
+'''
+
+# Shared note constants so repeated unsupported results don't rebuild the
+# same literals per call
+_EMBEDDING_NOTES = (
+    "Embedding calls are not supported yet; "
+    "consider a local sentence-transformers model",
+)
+_COMPLETION_NOTES = ("Legacy completion mapped onto a single user message",)
+_TOOL_NOTES = ("Function calling converted to Harmony tool namespace",)
+
+_SNIPPET_FOOTER = '''])
+
+tokens = encoding.render_conversation_for_completion(conversation, Role.ASSISTANT)
+response = inference.generate_with_tokens(tokens)
+'''
+
+# Per-call variable pieces as precompiled templates: one format call per
+# use instead of re-assembling the literals each conversion
+_HEADER_COMMENT = '# Converted from OpenAI {} call ({}:{})' + _NL
+
+_DEVELOPER_TEMPLATE = (
+    '    Message.from_role_and_content(' + _NL
+    + '        Role.DEVELOPER,' + _NL
+    + '        DeveloperContent.new().with_instructions({!r}),' + _NL
+    + '    ),' + _NL
+)
+
+_FALLBACK_USER_MESSAGE = (
+    '    Message.from_role_and_content(Role.USER, prompt),' + _NL
+)
+
+# Per-role message templates, replacing the per-message if/elif chain
+# Content is embedded via {!r} so Python's own repr handles quoting and
+# escaping in C; literal triple-quote interpolation broke on content
+# containing \"\"\" and re-parsed an f-string template per message.
+_ROLE_TEMPLATES = {
+    "user": '    Message.from_role_and_content(Role.USER, {!r}),' + _NL,
+    "assistant": (
+        '    Message.from_role_and_content(Role.ASSISTANT, {!r}),' + _NL
+    ),
+}
+
+
+class TargetModel(str, Enum):
+    """Local GPT-OSS model to migrate to."""
+    GPT_OSS_20B = "gpt-oss-20b"
+    GPT_OSS_120B = "gpt-oss-120b"
+
+
+class TargetBackend(str, Enum):
+    """Local inference backend serving the model."""
+    OLLAMA = "ollama"
+    VLLM = "vllm"
+
+
+class ConverterConfig(BaseModel):
+    """Configuration for a conversion run."""
+    model: TargetModel = TargetModel.GPT_OSS_20B
+    backend: TargetBackend = TargetBackend.OLLAMA
+    reasoning_effort: str = "medium"
+
+
+class ConversionResult(BaseModel):
+    """Result of converting a single API call."""
+    file: str
+    line: int
+    call_type: str
+    success: bool
+    converted_code: str = ""
+    notes: List[str] = []
+
+
+class ConversionSummary(BaseModel):
+    """Lightweight aggregate returned when results are streamed to a sink."""
+    total: int = 0
+    converted: int = 0
+    unsupported: int = 0
+
+
+class Converter:
+    """Converter producing Harmony-based replacements for OpenAI calls."""
+
+    def __init__(self, config: Optional[ConverterConfig] = None):
+        self.config = config or ConverterConfig()
+        # Config is fixed for the converter's lifetime; resolve the enum
+        # .value strings once so no per-call code touches the descriptors.
+        self._model_value = self.config.model.value
+        self._backend_value = self.config.backend.value
+        self._reasoning_upper = self.config.reasoning_effort.upper()
+        # Everything up to the developer message depends only on the config,
+        # so specialize it once here instead of re-interpolating per call.
+        self._snippet_header = (
+            _IMPORTS_BLOCK
+            + _NL
+            + 'encoding = load_harmony_encoding(HarmonyEncodingName.HARMONY_GPT_OSS)'
+            + _NL
+            + f'inference = LocalInference(model="{self._model_value}")'
+            + f'  # backend: {self._backend_value}'
+            + _NL + _NL
+            + 'conversation = Conversation.from_messages([' + _NL
+            + '    Message.from_role_and_content(' + _NL
+            + '        Role.SYSTEM,' + _NL
+            + '        SystemContent.new().with_reasoning_effort'
+            + f'(ReasoningEffort.{self._reasoning_upper}),' + _NL
+            + '    ),' + _NL
+        )
+        # O(1) bound-method dispatch instead of an if/elif chain per call
+        self._dispatch = {
+            'chat': self._convert_chat,
+            'completion': self._convert_completion,
+            'embedding': self._convert_embedding,
+        }
+
+    def convert_calls(
+        self,
+        calls: List[APICall],
+        progress_callback: Optional[Callable[[], None]] = None,
+        sink: Optional[Callable[[ConversionResult], None]] = None,
+    ):
+        """Convert many calls, fanning the work out over a thread pool.
+
+        Each call converts independently, so conversion is data-parallel;
+        results come back in input order.  ``progress_callback`` (if given)
+        is invoked once per completed call from the collecting thread.
+
+        When ``sink`` is given, each result (with its potentially large
+        ``converted_code`` string) is handed to it as soon as it completes
+        and not retained, so memory stays constant in the number of calls;
+        a :class:`ConversionSummary` is returned instead of the list.
+        """
+        if not calls:
+            return ConversionSummary() if sink is not None else []
+        max_workers = min(32, os.cpu_count() or 1)
+        summary = ConversionSummary()
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._convert_single_call, call) for call in calls
+            ]
+            for future in futures:
+                result = future.result()
+                if sink is not None:
+                    sink(result)
+                    summary.total += 1
+                    if result.success:
+                        summary.converted += 1
+                    else:
+                        summary.unsupported += 1
+                else:
+                    results.append(result)
+                if progress_callback is not None:
+                    progress_callback()
+        return summary if sink is not None else results
+
+    def _convert_single_call(
+        self, call: APICall, conversation: Optional[Dict] = None
+    ) -> ConversionResult:
+        """Convert one detected call into a Harmony replacement snippet."""
+        handler = self._dispatch.get(call.type)
+        if handler is None:
+            return ConversionResult(
+                file=call.file,
+                line=call.line,
+                call_type=call.type,
+                success=False,
+                notes=[f"Unsupported call type: {call.type}"],
+            )
+        return handler(call, conversation)
+
+    def _convert_chat(
+        self, call: APICall, conversation: Optional[Dict] = None
+    ) -> ConversionResult:
+        """Convert a chat completion call."""
+        if call.complexity == 'complex':
+            code = self._generate_harmony_code_with_tools(call, conversation)
+            notes = list(_TOOL_NOTES)
+        else:
+            code = self._generate_harmony_code(call, conversation)
+            notes = []
+        return ConversionResult(
+            file=call.file,
+            line=call.line,
+            call_type=call.type,
+            success=True,
+            converted_code=code,
+            notes=notes,
+        )
+
+    def _convert_completion(
+        self, call: APICall, conversation: Optional[Dict] = None
+    ) -> ConversionResult:
+        """Convert a legacy completion call."""
+        code = self._generate_harmony_code(call, conversation)
+        return ConversionResult(
+            file=call.file,
+            line=call.line,
+            call_type=call.type,
+            success=True,
+            converted_code=code,
+            notes=list(_COMPLETION_NOTES),
+        )
+
+    def _convert_embedding(
+        self, call: APICall, conversation: Optional[Dict] = None
+    ) -> ConversionResult:
+        """Embeddings have no Harmony equivalent yet."""
+        return ConversionResult(
+            file=call.file,
+            line=call.line,
+            call_type=call.type,
+            success=False,
+            notes=list(_EMBEDDING_NOTES),
+        )
+
+    def _generate_harmony_code(
+        self, call: APICall, conversation: Optional[Dict] = None
+    ) -> str:
+        """Generate the Harmony replacement snippet for a plain call."""
+        messages = (conversation or {}).get("messages", [])
+
+        # One fused pass: capture the first system/developer message as the
+        # instructions while emitting the user/assistant message lines.
+        # Generated lines go into a list joined once at the end — repeated
+        # str += is O(N^2) for conversations with many messages.
+        instructions = None
+        message_parts = []
+        for msg in messages:
+            role = msg["role"]
+            template = _ROLE_TEMPLATES.get(role)
+            if template is not None:
+                message_parts.append(template.format(msg["content"]))
+            elif instructions is None and role in ("system", "developer"):
+                instructions = self._extract_instructions(msg["content"])
+        if instructions is None:
+            instructions = "You are a helpful assistant."
+        if not message_parts:
+            message_parts.append(_FALLBACK_USER_MESSAGE)
+
+        return (
+            _HEADER_COMMENT.format(call.type, _basename(call.file), call.line)
+            + self._snippet_header
+            + _DEVELOPER_TEMPLATE.format(instructions)
+            + "".join(message_parts)
+            + _SNIPPET_FOOTER
+        )
+
+    @staticmethod
+    def _extract_instructions(content: str) -> str:
+        """Pull the instructions text out of a system/developer message.
+
+        Harmony-style developer content may carry '# Instructions' and
+        '# Tools' section markers; partition() handles both in single
+        linear passes without the intermediate lists split() allocates.
+        """
+        _, marker, rest = content.partition("# Instructions")
+        if marker:
+            content = rest
+        return content.partition("# Tools")[0].strip()
+
+    def _generate_harmony_code_with_tools(
+        self, call: APICall, conversation: Optional[Dict] = None
+    ) -> str:
+        """Generate a Harmony snippet that exposes the original functions."""
+        functions = (conversation or {}).get("functions", [])
+
+        tool_parts = []
+        for func in functions:
+            name = func.get("name", "tool")
+            description = func.get("description", "")
+            params_json = json.dumps(func.get("parameters", {}), indent=4)
+            # Single linear replace instead of split + generator + join
+            params_indented = "        " + params_json.replace(_NL, _NL + "        ")
+            tool_parts.append(
+                f'    ToolDescription.new({_NL}'
+                f'        {name!r},{_NL}'
+                f'        {description!r},{_NL}'
+                f'        parameters={params_indented.lstrip()},{_NL}'
+                f'    ),{_NL}'
+            )
+        tools_code = "".join(tool_parts)
+
+        base_code = self._generate_harmony_code(call, conversation)
+        tools_block = f'''
+# Tool definitions migrated from the OpenAI `functions` argument
+from openai_harmony import ToolDescription, ToolNamespaceConfig
+
+tools = ToolNamespaceConfig(
+    name="functions",
+    description="Migrated tools",
+    tools=[
+{tools_code}    ],
+)
+'''
+        return base_code + tools_block
+
+    def estimate_monthly_savings(self, calls: List[APICall]) -> float:
+        """Rough monthly savings estimate for migrating the given calls."""
+        from ..analyzer.cost_analyzer import CostAnalyzer
+
+        analyzer = CostAnalyzer()
+        return analyzer.analyze_calls(calls).potential_savings
@@ -0,0 +1,4 @@
+"""Core carrier models and configuration."""
+
+from .config import Config, InferenceConfig
+from .models import MigrationReport, ScanResult
@@ -0,0 +1,127 @@
+"""Configuration for migration runs, loadable from TOML, env, or defaults."""
+
+import os
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+import tomli_w
+
+from pydantic import BaseModel, ConfigDict, Field
+
+DEFAULT_CONFIG_FILE = "gpt-migrator.toml"
+
+# Env overrides pre-split into (env_var, field, sub_field) so load_from_env
+# neither rebuilds the mapping dict nor splits dotted paths per call.
+_ENV_MAPPING = (
+    ("GPT_MIGRATOR_MODEL", "model", None),
+    ("GPT_MIGRATOR_BACKEND", "backend", None),
+    ("GPT_MIGRATOR_REASONING", "reasoning_effort", None),
+    ("OLLAMA_HOST", "inference", "ollama_host"),
+    ("VLLM_HOST", "inference", "vllm_host"),
+)
+
+
+@lru_cache(maxsize=16)
+def _load_toml(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a TOML file, memoized on (path, mtime).
+
+    CLI subcommands re-load the config per invocation; the mtime key
+    keeps the cache correct when the file is edited between runs of a
+    long-lived process.
+    """
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+class InferenceConfig(BaseModel):
+    """Connection settings for the local inference backends."""
+    model_config = ConfigDict(frozen=True)
+
+    ollama_host: str = "http://localhost:11434"
+    vllm_host: str = "http://localhost:8000"
+    # Client-side coalescing for the batching vLLM backend
+    vllm_batch_window_ms: float = 8.0
+    vllm_max_batch: int = 16
+
+
+class Config(BaseModel):
+    """Top-level configuration for a migration run.
+
+    Frozen: migration code may consult the backend URL and validation
+    state per API call, so both are computed once per instance and the
+    immutability keeps those caches valid.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    model: str = "gpt-oss-20b"
+    backend: str = "ollama"
+    reasoning_effort: str = "medium"
+    inference: InferenceConfig = Field(default_factory=InferenceConfig)
+
+    @classmethod
+    def load_from_file(cls, config_path: Path) -> "Config":
+        """Load configuration from a TOML file."""
+        path = Path(config_path)
+        return cls(**_load_toml(str(path), path.stat().st_mtime))
+
+    @classmethod
+    def load_default(cls) -> "Config":
+        """Load the default config file if present, else built-in defaults."""
+        path = Path(DEFAULT_CONFIG_FILE)
+        if path.exists():
+            return cls.load_from_file(path)
+        return cls()
+
+    @classmethod
+    def load_from_env(cls) -> "Config":
+        """Build a configuration from environment variable overrides."""
+        data: Dict[str, Any] = {}
+        getenv = os.environ.get
+        for env_var, field_name, sub_field in _ENV_MAPPING:
+            value = getenv(env_var)
+            if value is None:
+                continue
+            if sub_field is None:
+                data[field_name] = value
+            else:
+                data.setdefault(field_name, {})[sub_field] = value
+        if not data:
+            return cls()
+        return cls(**data)
+
+    def save_to_file(self, config_path: Path) -> None:
+        """Write the configuration out as TOML."""
+        config_data = self.model_dump(mode="json")
+        with open(config_path, "wb") as f:
+            tomli_w.dump(config_data, f)
+
+    @cached_property
+    def _backend_url(self) -> str:
+        if self.backend == "vllm":
+            return self.inference.vllm_host
+        return self.inference.ollama_host
+
+    def get_backend_url(self) -> str:
+        """Base URL for the configured inference backend (cached)."""
+        return self._backend_url
+
+    @cached_property
+    def _validation_errors(self) -> List[str]:
+        errors = []
+        if self.backend not in ("ollama", "vllm"):
+            errors.append(f"Unknown backend: {self.backend}")
+        if self.reasoning_effort not in ("low", "medium", "high"):
+            errors.append(f"Unknown reasoning effort: {self.reasoning_effort}")
+        if not self.model:
+            errors.append("No model configured")
+        return errors
+
+    def validate_config(self) -> List[str]:
+        """Sanity-check the configuration (computed once per instance)."""
+        return self._validation_errors
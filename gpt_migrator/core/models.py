@@ -0,0 +1,117 @@
+"""Carrier models for scan results and migration reports."""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..scanner.scanner import APICall
+
+
+@dataclass(slots=True, frozen=True)
+class ScanColumns:
+    """Structure-of-arrays view over a scan's calls.
+
+    Bulk report computations read one or two fields from every call;
+    parallel tuples keep those values contiguous instead of hopping
+    between full APICall records.
+    """
+    files: Tuple[str, ...]
+    lines: Tuple[int, ...]
+    types: Tuple[str, ...]
+    complexities: Tuple[str, ...]
+    estimated_tokens: Tuple[Optional[int], ...]
+
+
+@dataclass(slots=True)
+class ScanResult:
+    """Everything a scan produced: the calls plus run metadata.
+
+    A slotted dataclass rather than a pydantic model — one of these wraps
+    thousands of calls on a large repo and needs no validation, so it
+    skips the per-instance ``__dict__`` and validator machinery.
+    """
+    calls: List[APICall] = field(default_factory=list)
+    files_scanned: int = 0
+    duration_seconds: float = 0.0
+
+    def to_json(self) -> bytes:
+        """Serialize the scan result to JSON bytes.
+
+        orjson walks the dataclasses natively in C; for thousands of
+        calls this skips building an intermediate dict tree entirely.
+        """
+        return orjson.dumps(self)
+
+    def to_columnar(self) -> ScanColumns:
+        """Build the SoA view; single pass, one tuple per column."""
+        files, lines, types, complexities, tokens = (
+            zip(
+                *(
+                    (c.file, c.line, c.type, c.complexity, c.estimated_tokens)
+                    for c in self.calls
+                )
+            )
+            if self.calls
+            else ((), (), (), (), ())
+        )
+        return ScanColumns(files, lines, types, complexities, tokens)
+
+    def total_estimated_tokens(self) -> int:
+        """Sum of known token estimates over the columnar view."""
+        return sum(
+            t for t in self.to_columnar().estimated_tokens if t is not None
+        )
+
+
+class MigrationReport(BaseModel):
+    """Summary report for a conversion run."""
+    model_config = ConfigDict(frozen=True)
+
+    total_calls: int
+    successful_conversions: int
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    @classmethod
+    def from_results(cls, results: Iterable[Any]) -> "MigrationReport":
+        """Build a report from conversion results (anything with .success)."""
+        total = 0
+        successful = 0
+        for result in results:
+            total += 1
+            successful += result.success
+        return cls(total_calls=total, successful_conversions=successful)
+
+    def to_json(self) -> bytes:
+        """Serialize the report to JSON bytes (datetime handled by orjson)."""
+        return orjson.dumps(self.model_dump(), option=orjson.OPT_INDENT_2)
+
+    @property
+    def failed_conversions(self) -> int:
+        """Derived from the totals rather than stored redundantly."""
+        return self.total_calls - self.successful_conversions
+
+    # The model is frozen, so these stay valid; a report is typically
+    # rendered several times (console, JSON export, logs).
+    @cached_property
+    def success_rate(self) -> float:
+        """Fraction of calls that converted successfully."""
+        if not self.total_calls:
+            return 0.0
+        return self.successful_conversions / self.total_calls
+
+    @cached_property
+    def summary(self) -> Dict[str, Any]:
+        """Flat dict view of the report for display and export."""
+        return {
+            "total_calls": self.total_calls,
+            "successful_conversions": self.successful_conversions,
+            "failed_conversions": self.failed_conversions,
+            "success_rate": f"{self.success_rate:.1%}",
+            "created_at": self.created_at.isoformat(),
+        }
@@ -0,0 +1,3 @@
+"""Harmony conversation building module."""
+
+from .harmony_builder import HarmonyBuilder, ReasoningEffort
@@ -0,0 +1,323 @@
+"""Builder for Harmony-format conversations and prompts.
+
+Produces the dict-based conversation structure and the textual Harmony
+prompt (``<|start|>role<|message|>content<|end|>``) consumed by the local
+inference backends, without requiring the ``openai_harmony`` bindings.
+"""
+
+import hashlib
+import json
+import sys
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class ReasoningEffort(str, Enum):
+    """Reasoning effort requested from the local model."""
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+# The system prompt depends only on the reasoning effort, so all three
+# variants are rendered once at import time instead of per conversation.
+_SYSTEM_PROMPT_TEMPLATE = (
+    "You are a helpful AI assistant.\n"
+    "Knowledge cutoff: 2024-06\n"
+    "Reasoning: {effort}\n"
+    "# Valid channels: analysis, commentary, final."
+)
+
+_SYSTEM_PROMPTS: Dict[ReasoningEffort, str] = {
+    effort: _SYSTEM_PROMPT_TEMPLATE.format(effort=effort.value)
+    for effort in ReasoningEffort
+}
+
+
+# Hot dict keys and role values, interned so the per-message dict lookups
+# hit the pointer-equality fast path instead of comparing characters.
+_K_ROLE = sys.intern("role")
+_K_CONTENT = sys.intern("content")
+_K_MESSAGES = sys.intern("messages")
+_R_SYSTEM = sys.intern("system")
+_R_DEVELOPER = sys.intern("developer")
+_R_USER = sys.intern("user")
+_R_ASSISTANT = sys.intern("assistant")
+
+_INSTRUCTIONS_PREFIX = "# Instructions\n"
+
+# Byte-level marker constants for the wire path, plus the role names
+# pre-encoded once (HTTP backends ultimately send UTF-8 bytes; encoding
+# str prompts a second time would double the work).
+_B_START = b"<|start|>"
+_B_MESSAGE = b"<|message|>"
+_B_END = b"<|end|>\n"
+_B_ASSISTANT_START = b"<|start|>assistant\n"
+_ROLE_BYTES = {
+    role: role.encode()
+    for role in (_R_SYSTEM, _R_DEVELOPER, _R_USER, _R_ASSISTANT)
+}
+
+_ALLOWED_ROLES = frozenset({_R_SYSTEM, _R_DEVELOPER, _R_USER, _R_ASSISTANT})
+
+
+# Message construction is centralized in per-role factories instead of
+# dict literals scattered through the builder methods; each produces the
+# minimal pre-shaped dict for its role.
+def _developer_msg(content: str) -> Dict[str, str]:
+    return {_K_ROLE: _R_DEVELOPER, _K_CONTENT: _INSTRUCTIONS_PREFIX + content}
+
+
+def _user_msg(content: str) -> Dict[str, str]:
+    return {_K_ROLE: _R_USER, _K_CONTENT: content}
+
+
+def _assistant_msg(content: str) -> Dict[str, str]:
+    return {_K_ROLE: _R_ASSISTANT, _K_CONTENT: content}
+
+
+def _system_msg(content: str) -> Dict[str, str]:
+    return {_K_ROLE: _R_SYSTEM, _K_CONTENT: content}
+
+
+# Flyweight system messages: content depends only on the reasoning effort,
+# so the three header dicts are built once and shared read-only across all
+# conversations (consumers never mutate the system message).
+_SYSTEM_MSGS = {
+    effort: MappingProxyType(_system_msg(_SYSTEM_PROMPTS[effort]))
+    for effort in ReasoningEffort
+}
+
+# OpenAI role -> message factory; one hashed lookup per message instead of
+# a chain of string comparisons (unknown roles fall back to user).
+_ROLE_HANDLERS = {
+    _R_SYSTEM: _developer_msg,
+    _R_USER: _user_msg,
+    _R_ASSISTANT: _assistant_msg,
+}
+
+# Compiled prompt serializers keyed by the conversation's role shape.
+# Real workloads see a handful of shapes (system+user, system+developer+user,
+# ...), so each shape is compiled once into straight-line code and reused.
+_SERIALIZER_CACHE: Dict[
+    Tuple[str, ...], Callable[[List[Dict[str, Any]]], str]
+] = {}
+
+
+def _compile_serializer(
+    roles: Tuple[str, ...]
+) -> Callable[[List[Dict[str, Any]]], str]:
+    """Compile a serializer specialized to one sequence of roles.
+
+    The role markers are baked in as literals (via repr, so arbitrary role
+    strings stay safe), leaving only the content indexing at runtime —
+    no loop, no per-message dict lookups for the role.
+    """
+    src = ["def _serialize(msgs):\n    return ("]
+    for i, role in enumerate(roles):
+        prefix = f"<|start|>{role}<|message|>"
+        src.append(f"\n        {prefix!r} + msgs[{i}]['content'] + '<|end|>\\n' +")
+    src.append("\n        '<|start|>assistant\\n'\n    )\n")
+    namespace: Dict[str, Any] = {}
+    exec("".join(src), namespace)
+    return namespace["_serialize"]
+
+
+class HarmonyBuilder:
+    """Builder turning OpenAI-style messages into Harmony conversations."""
+
+    def __init__(self):
+        # Rendered TypeScript blocks keyed by a digest of the function
+        # definition; repos tend to repeat the same schemas across calls.
+        self._tool_cache: Dict[bytes, str] = {}
+
+    def _build_system_content(self, reasoning_effort: ReasoningEffort) -> str:
+        """Return the (precomputed) system prompt for a reasoning effort."""
+        return _SYSTEM_PROMPTS[reasoning_effort]
+
+    def build_conversation(
+        self,
+        messages: List[Dict[str, Any]],
+        reasoning_effort: ReasoningEffort = ReasoningEffort.MEDIUM,
+    ) -> Dict[str, Any]:
+        """Build a Harmony conversation from OpenAI-style messages."""
+        # Fast path for the dominant shape — a single user message —
+        # skipping the loop and dispatch machinery entirely.
+        if len(messages) == 1:
+            msg = messages[0]
+            if msg.get(_K_ROLE, _R_USER) == _R_USER:
+                return self._two_message_conversation(
+                    msg.get(_K_CONTENT, ""), reasoning_effort
+                )
+        return self._build_conversation_indexed(messages, reasoning_effort)[0]
+
+    def _two_message_conversation(
+        self, content: str, reasoning_effort: ReasoningEffort
+    ) -> Dict[str, Any]:
+        """Pre-shaped system + single-user conversation."""
+        return {
+            _K_MESSAGES: [_SYSTEM_MSGS[reasoning_effort], _user_msg(content)]
+        }
+
+    def _build_conversation_indexed(
+        self,
+        messages: List[Dict[str, Any]],
+        reasoning_effort: ReasoningEffort,
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        """Build a conversation and the index of its developer message.
+
+        The index is recorded while the list is built so callers that need
+        to amend the developer message (tool injection) don't re-scan the
+        messages afterwards.
+        """
+        harmony_messages: List[Any] = [_SYSTEM_MSGS[reasoning_effort]]
+        developer_idx: Optional[int] = None
+
+        handlers_get = _ROLE_HANDLERS.get
+        append = harmony_messages.append
+        for msg in messages:
+            handler = handlers_get(msg.get(_K_ROLE, _R_USER), _user_msg)
+            if handler is _developer_msg and developer_idx is None:
+                developer_idx = len(harmony_messages)
+            append(handler(msg.get(_K_CONTENT, "")))
+
+        return {_K_MESSAGES: harmony_messages}, developer_idx
+
+    def build_completion_conversation(
+        self,
+        prompt: str,
+        reasoning_effort: ReasoningEffort = ReasoningEffort.MEDIUM,
+    ) -> Dict[str, Any]:
+        """Build a Harmony conversation for a legacy completion prompt."""
+        return self._two_message_conversation(prompt, reasoning_effort)
+
+    def build_conversation_with_tools(
+        self,
+        messages: List[Dict[str, Any]],
+        functions: List[Dict[str, Any]],
+        reasoning_effort: ReasoningEffort = ReasoningEffort.MEDIUM,
+    ) -> Dict[str, Any]:
+        """Build a conversation exposing the original OpenAI functions."""
+        conversation, developer_idx = self._build_conversation_indexed(
+            messages, reasoning_effort
+        )
+        tools_section = self._build_tools_section(functions)
+
+        # Append the tool namespace to the developer message (its index was
+        # recorded during construction), creating one if the original
+        # conversation had no system message.
+        if developer_idx is not None:
+            developer = conversation[_K_MESSAGES][developer_idx]
+            developer[_K_CONTENT] += "\n\n" + tools_section
+        else:
+            # Raw tools section: no '# Instructions' prefix wanted here
+            conversation[_K_MESSAGES].insert(
+                1, {_K_ROLE: _R_DEVELOPER, _K_CONTENT: tools_section}
+            )
+
+        return conversation
+
+    def _build_tools_section(self, functions: List[Dict[str, Any]]) -> str:
+        """Render the TypeScript-style tool namespace for the developer message."""
+        parts = ["# Tools\n\nnamespace functions {\n"]
+        for func in functions:
+            # Identical schemas recur across a scan; render each distinct
+            # definition once and reuse the block by content digest.
+            key = hashlib.blake2b(
+                json.dumps(func, sort_keys=True).encode(), digest_size=16
+            ).digest()
+            block = self._tool_cache.get(key)
+            if block is None:
+                block = self._build_tool_block(func)
+                self._tool_cache[key] = block
+            parts.append(block)
+        parts.append("}")
+        return "".join(parts)
+
+    @staticmethod
+    def _build_tool_block(func: Dict[str, Any]) -> str:
+        """Render the TypeScript declaration for a single function."""
+        name = func.get("name", "tool")
+        description = func.get("description", "")
+        parameters = func.get("parameters", {})
+        lines = []
+        append = lines.append
+        if description:
+            append(f"// {description}\n")
+        append(f"type {name} = (")
+        properties = parameters.get("properties", {})
+        if properties:
+            append("_: {\n")
+            required = parameters.get("required", [])
+            for prop_name, prop in properties.items():
+                prop_type = prop.get("type", "string")
+                optional = "" if prop_name in required else "?"
+                if prop.get("description"):
+                    append(f"// {prop['description']}\n")
+                append(f"{prop_name}{optional}: {prop_type},\n")
+            append("}")
+        append(") => any;\n\n")
+        return "".join(lines)
+
+    def generate_harmony_prompt(self, conversation: Dict[str, Any]) -> str:
+        """Render a conversation as a raw Harmony prompt string."""
+        messages = conversation[_K_MESSAGES]
+        roles = tuple(msg[_K_ROLE] for msg in messages)
+        serializer = _SERIALIZER_CACHE.get(roles)
+        if serializer is None:
+            serializer = _SERIALIZER_CACHE[roles] = _compile_serializer(roles)
+        return serializer(messages)
+
+    def generate_harmony_prompt_bytes(
+        self, conversation: Dict[str, Any]
+    ) -> bytes:
+        """Render a conversation straight to UTF-8 bytes.
+
+        Callers that feed an HTTP backend should use this instead of
+        encoding the str prompt a second time; only the message content
+        is encoded at runtime, the markers and role names are pre-encoded
+        constants.
+        """
+        parts = []
+        append = parts.append
+        role_bytes_get = _ROLE_BYTES.get
+        for msg in conversation[_K_MESSAGES]:
+            role = msg[_K_ROLE]
+            append(_B_START)
+            append(role_bytes_get(role) or role.encode())
+            append(_B_MESSAGE)
+            append(msg[_K_CONTENT].encode())
+            append(_B_END)
+        append(_B_ASSISTANT_START)
+        return b"".join(parts)
+
+    def validate_conversation(
+        self, conversation: Dict[str, Any]
+    ) -> List[str]:
+        """Validate a conversation structure, returning a list of errors."""
+        errors: List[str] = []
+        messages = conversation.get(_K_MESSAGES)
+        if messages is None:
+            errors.append("Conversation has no 'messages' key")
+            return errors
+
+        # Single pass with the append bound to a local; this runs once per
+        # conversion, so the per-message bytecode count matters.
+        errors_append = errors.append
+        has_system = False
+        for i, msg in enumerate(messages):
+            role = msg.get(_K_ROLE)
+            if role is None:
+                errors_append(f"Message {i} has no role")
+            elif role not in _ALLOWED_ROLES:
+                errors_append(f"Message {i} has unknown role: {role}")
+            elif role == _R_SYSTEM:
+                has_system = True
+            if _K_CONTENT not in msg:
+                errors_append(f"Message {i} has no content")
+
+        if not has_system:
+            errors_append("Conversation has no system message")
+
+        return errors
@@ -0,0 +1,10 @@
+"""Inference module for running local GPT-OSS models."""
+
+from .backends import (
+    BackendError,
+    BatchingVLLMBackend,
+    OllamaBackend,
+    VLLMBackend,
+)
+from .cache import ResponseCache
+from .inference import AsyncLocalInference, LocalInference
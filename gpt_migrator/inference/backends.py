@@ -0,0 +1,506 @@
+"""HTTP backends for local inference servers (Ollama and vLLM)."""
+
+import asyncio
+import gzip
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+import orjson
+import requests
+from requests.adapters import HTTPAdapter, Retry
+
+from ..harmony.harmony_builder import HarmonyBuilder
+
+
+class BackendError(RuntimeError):
+    """Raised when an inference backend request fails."""
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_GZIP_HEADERS = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+
+# Bodies below this stay uncompressed: gzip overhead beats the saving.
+_GZIP_THRESHOLD = 4096
+
+
+def _build_shared_session() -> requests.Session:
+    """Process-wide pooled session shared by every backend instance.
+
+    Keep-alive connections then survive backend (and LocalInference)
+    construction, so creating many short-lived clients against the same
+    server reuses sockets instead of re-handshaking. requests.Session is
+    thread-safe for concurrent use of mounted adapters.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.1),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SHARED_SESSION = _build_shared_session()
+
+
+def _prepare_body(
+    body: bytes, compress: bool = False
+) -> Tuple[bytes, Dict[str, str]]:
+    """Gzip large JSON bodies so long conversations upload in fewer bytes.
+
+    Level 1 keeps the CPU cost negligible while still shrinking text
+    payloads several-fold.  Off unless the caller opted in: stock Ollama
+    and vLLM servers don't decompress request bodies, so compression is
+    only safe behind a proxy (or patched server) known to inflate them.
+    """
+    if compress and len(body) > _GZIP_THRESHOLD:
+        return gzip.compress(body, compresslevel=1), _GZIP_HEADERS
+    return body, _JSON_HEADERS
+
+
+# Role -> prompt-line prefix for Ollama's plain-text format (developer
+# content reads as user instructions to the model).
+_OLLAMA_PREFIX = {
+    "system": "System: ",
+    "developer": "User: ",
+    "user": "User: ",
+    "assistant": "Assistant: ",
+}
+
+@lru_cache(maxsize=128)
+def _ollama_prompt_from_frozen(messages: Tuple[Tuple[str, str], ...]) -> str:
+    """Render a frozen (role, content) tuple as an Ollama prompt.
+
+    Retries and streaming continuations resend identical conversations;
+    memoizing on the hashable form skips re-walking the messages.
+    """
+    prefix = _OLLAMA_PREFIX.get
+    parts = [prefix(role, "User: ") + content for role, content in messages]
+    parts.append("Assistant:")
+    return "\n\n".join(parts)
+
+
+# Builder role -> OpenAI chat role for vLLM (developer instructions are
+# sent as user content; unknown roles fall back to user via .get).
+_VLLM_ROLE = {
+    "system": "system",
+    "developer": "user",
+    "user": "user",
+    "assistant": "assistant",
+}
+
+
+class BaseBackend:
+    """Shared HTTP plumbing for the inference backends."""
+
+    def __init__(self, model: str, host: str, timeout: float = 120.0,
+                 compress_requests: bool = False):
+        self.model = model
+        self.host = host.rstrip("/")
+        self.timeout = timeout
+        # Opt-in: only enable against a server/proxy that is known to
+        # decompress gzip request bodies (stock Ollama and vLLM don't).
+        self.compress_requests = compress_requests
+        # Keep-alive connection pool: without it every generate() pays a
+        # fresh TCP handshake against the local server, which dominates
+        # latency for short completions. The pool lives at module scope so
+        # connections are shared across all backend instances.
+        self._session = _SHARED_SESSION
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Short-TTL caches: model metadata rarely changes and reachability
+        # is frequently polled by health checks and UIs.
+        self._info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._info_ttl = 60.0
+        self._conn_cache: Optional[Tuple[float, bool]] = None
+        self._conn_ttl = 5.0
+
+    @property
+    def aclient(self) -> httpx.AsyncClient:
+        """Long-lived async client, created on first use.
+
+        One pooled client per backend lets concurrent agenerate calls
+        share keep-alive connections instead of serializing on the
+        blocking session.  The pool's sockets belong to the loop that
+        opened them, so the client is rebuilt whenever the running loop
+        changes — otherwise the second asyncio.run() in a process fails
+        with "Event loop is closed".
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient_loop = loop
+            self._aclient = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30,
+                ),
+                timeout=self.timeout,
+            )
+        return self._aclient
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Model metadata, cached for a minute between server fetches."""
+        now = time.monotonic()
+        if self._info_cache is not None and now - self._info_cache[0] < self._info_ttl:
+            return self._info_cache[1]
+        info = self._fetch_model_info()
+        self._info_cache = (now, info)
+        return info
+
+    def test_connection(self) -> bool:
+        """Server reachability, cached for a few seconds."""
+        now = time.monotonic()
+        if self._conn_cache is not None and now - self._conn_cache[0] < self._conn_ttl:
+            return self._conn_cache[1]
+        reachable = self._probe_connection()
+        self._conn_cache = (now, reachable)
+        return reachable
+
+    def close(self) -> None:
+        """Release per-instance resources.
+
+        The shared session is deliberately left open: its pool belongs to
+        the process, not this instance.
+        """
+
+
+class OllamaBackend(BaseBackend):
+    """Backend talking to an Ollama server's /api/generate endpoint."""
+
+    def __init__(self, model: str = "gpt-oss:20b",
+                 host: str = "http://localhost:11434", timeout: float = 120.0,
+                 compress_requests: bool = False):
+        super().__init__(model, host, timeout, compress_requests)
+        # Everything but the prompt is constant for this backend, so the
+        # static half of the JSON body is serialized once here; generate()
+        # only encodes the prompt and splices it in.
+        self._payload_prefix = orjson.dumps({
+            "model": self.model,
+            "stream": False,
+            "options": {"temperature": 0.7, "top_p": 0.9, "num_predict": 2048},
+        })[:-1]
+
+    def _build_payload(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "prompt": self._convert_to_prompt(conversation),
+            "stream": False,
+            "options": {"temperature": 0.7, "top_p": 0.9, "num_predict": 2048},
+        }
+
+    def _encode_payload(self, conversation: Dict[str, Any]) -> bytes:
+        return (
+            self._payload_prefix
+            + b',"prompt":'
+            + orjson.dumps(self._convert_to_prompt(conversation))
+            + b"}"
+        )
+
+    def generate(self, conversation: Dict[str, Any]) -> str:
+        """Generate a completion for a builder conversation."""
+        body, headers = _prepare_body(
+            self._encode_payload(conversation), self.compress_requests
+        )
+        try:
+            response = self._session.post(
+                f"{self.host}/api/generate",
+                data=body,
+                headers=headers,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            raise BackendError(f"Ollama request failed: {exc}") from exc
+        return orjson.loads(response.content)["response"]
+
+    async def agenerate(self, conversation: Dict[str, Any]) -> str:
+        """Async variant of :meth:`generate` for concurrent callers."""
+        body, headers = _prepare_body(
+            self._encode_payload(conversation), self.compress_requests
+        )
+        try:
+            response = await self.aclient.post(
+                f"{self.host}/api/generate",
+                content=body,
+                headers=headers,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise BackendError(f"Ollama request failed: {exc}") from exc
+        return orjson.loads(response.content)["response"]
+
+    def generate_stream(self, conversation: Dict[str, Any]) -> Iterator[str]:
+        """Yield response chunks as the server produces them.
+
+        Cuts time-to-first-token from full-generation latency to
+        first-token latency; callers can render output immediately.
+        """
+        payload = self._build_payload(conversation)
+        payload["stream"] = True
+        try:
+            with self._session.post(
+                f"{self.host}/api/generate",
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        return
+        except requests.RequestException as exc:
+            raise BackendError(f"Ollama request failed: {exc}") from exc
+
+    def _convert_to_prompt(self, conversation: Dict[str, Any]) -> str:
+        """Flatten a conversation into Ollama's plain-text prompt format."""
+        # Bound .get per message: builder conversations share their system
+        # message as a read-only mapping proxy, which unbound dict.get
+        # would reject.
+        frozen = tuple(
+            (msg.get("role", "user"), msg.get("content", ""))
+            for msg in conversation.get("messages", ())
+        )
+        return _ollama_prompt_from_frozen(frozen)
+
+    def _probe_connection(self) -> bool:
+        try:
+            response = self._session.get(f"{self.host}/api/tags", timeout=5)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+
+    def _fetch_model_info(self) -> Dict[str, Any]:
+        try:
+            response = self._session.post(
+                f"{self.host}/api/show",
+                data=orjson.dumps({"name": self.model}),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            raise BackendError(f"Ollama request failed: {exc}") from exc
+        return orjson.loads(response.content)
+
+
+class VLLMBackend(BaseBackend):
+    """Backend talking to a vLLM server's OpenAI-compatible API."""
+
+    def __init__(self, model: str = "openai/gpt-oss-20b",
+                 host: str = "http://localhost:8000", timeout: float = 120.0,
+                 compress_requests: bool = False):
+        super().__init__(model, host, timeout, compress_requests)
+        # Static half of the JSON body, serialized once (see OllamaBackend).
+        self._payload_prefix = orjson.dumps({
+            "model": self.model,
+            "temperature": 0.7,
+            "max_tokens": 2048,
+            "stream": False,
+        })[:-1]
+
+    def _build_payload(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": self._convert_to_messages(conversation),
+            "temperature": 0.7,
+            "max_tokens": 2048,
+            "stream": False,
+        }
+
+    def _encode_payload(self, conversation: Dict[str, Any]) -> bytes:
+        return (
+            self._payload_prefix
+            + b',"messages":'
+            + orjson.dumps(self._convert_to_messages(conversation))
+            + b"}"
+        )
+
+    def generate(self, conversation: Dict[str, Any]) -> str:
+        """Generate a completion for a builder conversation."""
+        body, headers = _prepare_body(
+            self._encode_payload(conversation), self.compress_requests
+        )
+        try:
+            response = self._session.post(
+                f"{self.host}/v1/chat/completions",
+                data=body,
+                headers=headers,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            raise BackendError(f"vLLM request failed: {exc}") from exc
+        return orjson.loads(response.content)["choices"][0]["message"]["content"]
+
+    async def agenerate(self, conversation: Dict[str, Any]) -> str:
+        """Async variant of :meth:`generate` for concurrent callers."""
+        body, headers = _prepare_body(
+            self._encode_payload(conversation), self.compress_requests
+        )
+        try:
+            response = await self.aclient.post(
+                f"{self.host}/v1/chat/completions",
+                content=body,
+                headers=headers,
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise BackendError(f"vLLM request failed: {exc}") from exc
+        return orjson.loads(response.content)["choices"][0]["message"]["content"]
+
+    def generate_stream(self, conversation: Dict[str, Any]) -> Iterator[str]:
+        """Yield response chunks from the SSE stream."""
+        payload = self._build_payload(conversation)
+        payload["stream"] = True
+        try:
+            with self._session.post(
+                f"{self.host}/v1/chat/completions",
+                data=orjson.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line.startswith(b"data: "):
+                        continue
+                    data = line[6:]
+                    if data == b"[DONE]":
+                        return
+                    delta = orjson.loads(data)["choices"][0].get("delta", {})
+                    content = delta.get("content")
+                    if content:
+                        yield content
+        except requests.RequestException as exc:
+            raise BackendError(f"vLLM request failed: {exc}") from exc
+
+    def _convert_to_messages(
+        self, conversation: Dict[str, Any]
+    ) -> List[Dict[str, str]]:
+        """Map a builder conversation onto OpenAI-style chat messages."""
+        role = _VLLM_ROLE.get
+        return [
+            {
+                "role": role(msg.get("role", "user"), "user"),
+                "content": msg.get("content", ""),
+            }
+            for msg in conversation.get("messages", ())
+        ]
+
+    def _probe_connection(self) -> bool:
+        try:
+            response = self._session.get(f"{self.host}/v1/models", timeout=5)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+
+    def _fetch_model_info(self) -> Dict[str, Any]:
+        try:
+            response = self._session.get(
+                f"{self.host}/v1/models", timeout=self.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as exc:
+            raise BackendError(f"vLLM request failed: {exc}") from exc
+        return orjson.loads(response.content)
+
+
+class BatchingVLLMBackend:
+    """Coalesces concurrent generate calls into one vLLM batch request.
+
+    vLLM's /v1/completions endpoint accepts a list of prompts; queueing
+    callers for a few milliseconds and sending them together amortizes
+    the HTTP overhead and lets the server's continuous batching see all
+    the tokens at once.
+    """
+
+    def __init__(self, backend: Optional[VLLMBackend] = None,
+                 max_batch: int = 16, batch_window_ms: float = 8.0):
+        self.backend = backend or VLLMBackend()
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000.0
+        self._builder = HarmonyBuilder()
+        self._queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]" = (
+            asyncio.Queue()
+        )
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def agenerate(self, conversation: Dict[str, Any]) -> str:
+        """Queue a conversation and await its slice of the next batch."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((conversation, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.ensure_future(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        batch = []
+        get_nowait = self._queue.get_nowait
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        # Overflow beyond max_batch starts its next window immediately.
+        rescheduled = not self._queue.empty()
+        if rescheduled:
+            self._flush_task = asyncio.ensure_future(self._flush())
+        if not batch:
+            return
+
+        prompts = [
+            self._builder.generate_harmony_prompt(conv) for conv, _ in batch
+        ]
+        try:
+            try:
+                texts = await self._post_batch(prompts)
+            except Exception as exc:  # resolve every waiter, never hang them
+                error = (
+                    exc
+                    if isinstance(exc, BackendError)
+                    else BackendError(f"vLLM batch request failed: {exc}")
+                )
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            for (_, future), text in zip(batch, texts):
+                if not future.done():
+                    future.set_result(text)
+        finally:
+            # Callers that enqueued while the batch was in flight saw a
+            # live flush task and didn't schedule one of their own; pick
+            # them up now or they'd wait for an arrival that may never come.
+            if not rescheduled and not self._queue.empty():
+                self._flush_task = asyncio.ensure_future(self._flush())
+
+    async def _post_batch(self, prompts: List[str]) -> List[str]:
+        payload = {
+            "model": self.backend.model,
+            "prompt": prompts,
+            "temperature": 0.7,
+            "max_tokens": 2048,
+            "stream": False,
+        }
+        response = await self.backend.aclient.post(
+            f"{self.backend.host}/v1/completions",
+            content=orjson.dumps(payload),
+            headers=_JSON_HEADERS,
+        )
+        response.raise_for_status()
+        texts = [""] * len(prompts)
+        for choice in orjson.loads(response.content)["choices"]:
+            texts[choice["index"]] = choice["text"]
+        return texts
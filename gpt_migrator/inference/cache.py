@@ -0,0 +1,73 @@
+"""Exact-match response cache for local inference.
+
+Identical conversations re-invoke the model for seconds at a time; a
+cache hit returns in microseconds. Keys are SHA-256 digests of the
+canonicalized (model, conversation) pair, values live in SQLite so the
+cache survives across CLI invocations when given a file path.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+
+
+class ResponseCache:
+    """SQLite-backed cache mapping conversation digests to responses."""
+
+    def __init__(self, path: str = ":memory:", ttl: float = 3600.0):
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+        )
+        self._conn.commit()
+        self._db_lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def make_key(model: str, conversation: Dict[str, Any]) -> str:
+        """Digest of the canonical JSON form of (model, conversation).
+
+        ``default=dict`` covers the builder's read-only mapping-proxy
+        messages, which orjson won't serialize directly.
+        """
+        payload = orjson.dumps(
+            {"conversation": conversation, "model": model},
+            option=orjson.OPT_SORT_KEYS,
+            default=dict,
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def lock_for(self, key: str) -> threading.Lock:
+        """Per-key lock so concurrent misses generate only once."""
+        with self._db_lock:
+            lock = self._key_locks.get(key)
+            if lock is None:
+                lock = self._key_locks[key] = threading.Lock()
+            return lock
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None if absent/expired."""
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return orjson.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value under a key with the configured TTL."""
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, orjson.dumps(value), time.time() + self.ttl),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
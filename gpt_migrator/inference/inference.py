@@ -0,0 +1,206 @@
+"""Local inference against an Ollama-served GPT-OSS model.
+
+Concurrency notes: the Ollama server answers requests in parallel up to
+``OLLAMA_NUM_PARALLEL`` (per loaded model) and keeps up to
+``OLLAMA_MAX_LOADED_MODELS`` models resident.  Use
+:class:`AsyncLocalInference` with ``asyncio.gather`` to keep multiple
+requests in flight; a single blocking client serializes on the HTTP
+round-trip and leaves that parallelism unused.
+"""
+
+import asyncio
+import time
+from functools import cached_property
+from typing import Any, Dict, List, Literal, Optional
+
+import ollama
+from openai_harmony import HarmonyEncodingName, load_harmony_encoding
+from pydantic import BaseModel, ValidationError, model_validator
+
+from .backends import BaseBackend, OllamaBackend
+from .cache import ResponseCache
+
+
+class _MessageSchema(BaseModel):
+    role: Literal["system", "developer", "user", "assistant"]
+    content: str
+
+
+class ConversationSchema(BaseModel):
+    """Schema for builder conversations, validated in pydantic-core.
+
+    One Rust-backed call replaces the per-message Python loop on every
+    generate(); the shape mirrors HarmonyBuilder's output.
+    """
+    messages: List[_MessageSchema]
+
+    @model_validator(mode="after")
+    def _require_system_message(self) -> "ConversationSchema":
+        if not any(m.role == "system" for m in self.messages):
+            raise ValueError("conversation has no system message")
+        return self
+
+
+class _InferenceBase:
+    """Shared setup for sync and async inference clients."""
+
+    def __init__(self, model: str = "gpt-oss-20b", host: Optional[str] = None):
+        self.model = model
+        self.host = host
+
+    @cached_property
+    def encoding(self):
+        """Harmony encoding, loaded on first token-path use.
+
+        Lazy so the message path (``generate``) never pays the vocab
+        load, and construction stays cheap for all callers.
+        """
+        return load_harmony_encoding(HarmonyEncodingName.HARMONY_GPT_OSS)
+
+    def _render_prompt(self, tokens: List[int]) -> str:
+        """Decode pre-rendered Harmony tokens back into a raw prompt."""
+        return self.encoding.decode(tokens)
+
+    def _parse_completion(self, completion_text: str):
+        """Parse a raw completion back into Harmony messages."""
+        completion_tokens = self.encoding.encode(
+            completion_text, allowed_special="all"
+        )
+        return self.encoding.parse_messages_from_completion_tokens(
+            completion_tokens, role=None
+        )
+
+
+class LocalInference(_InferenceBase):
+    """Blocking inference client backed by the Ollama SDK."""
+
+    def __init__(self, model: str = "gpt-oss-20b", host: Optional[str] = None,
+                 backend: Optional[BaseBackend] = None,
+                 cache: Optional[ResponseCache] = None):
+        super().__init__(model=model, host=host)
+        self.client = ollama.Client(host=host)
+        self.backend = backend or OllamaBackend(
+            model=model, **({"host": host} if host else {})
+        )
+        self.cache = cache
+
+    @staticmethod
+    def _check_conversation(conversation: Dict[str, Any]) -> None:
+        try:
+            ConversationSchema.model_validate(conversation)
+        except ValidationError as exc:
+            details = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+                for err in exc.errors()
+            )
+            raise ValueError(f"Invalid conversation: {details}") from exc
+
+    def generate(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a completion for a builder conversation via the backend.
+
+        With a :class:`ResponseCache` attached, identical conversations
+        are served from the cache; the per-key lock makes concurrent
+        misses for the same conversation generate only once.
+        """
+        self._check_conversation(conversation)
+        if self.cache is None:
+            return self._generate_uncached(conversation)
+
+        key = ResponseCache.make_key(self.model, conversation)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        with self.cache.lock_for(key):
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            result = self._generate_uncached(conversation)
+            self.cache.set(key, result)
+            return result
+
+    def generate_stream(self, conversation: Dict[str, Any]):
+        """Yield response chunks as they arrive (bypasses the cache)."""
+        self._check_conversation(conversation)
+        yield from self.backend.generate_stream(conversation)
+
+    def _generate_uncached(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
+        # perf_counter_ns is monotonic and immune to wall-clock steps
+        # (NTP adjustments can make time.time() deltas negative).
+        start_ns = time.perf_counter_ns()
+        response = self.backend.generate(conversation)
+        return {
+            "response": response,
+            "response_time": (time.perf_counter_ns() - start_ns) / 1e9,
+            "model": self.model,
+        }
+
+    async def agenerate(self, conversation: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of :meth:`generate`; overlap calls with gather."""
+        self._check_conversation(conversation)
+        start_ns = time.perf_counter_ns()
+        response = await self.backend.agenerate(conversation)
+        return {
+            "response": response,
+            "response_time": (time.perf_counter_ns() - start_ns) / 1e9,
+            "model": self.model,
+        }
+
+    async def agenerate_batch(
+        self, conversations: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Run many conversations concurrently over the pooled client."""
+        return list(
+            await asyncio.gather(*(self.agenerate(c) for c in conversations))
+        )
+
+    def generate_with_tokens(self, tokens: List[int]):
+        """Run a completion for pre-rendered Harmony tokens.
+
+        Returns the parsed Harmony messages of the completion.
+        """
+        response = self.client.generate(
+            model=self.model,
+            prompt=self._render_prompt(tokens),
+            raw=True,
+        )
+        return self._parse_completion(response["response"])
+
+
+class AsyncLocalInference(_InferenceBase):
+    """Async inference client backed by Ollama's ``AsyncClient``.
+
+    Awaiting several ``generate_with_tokens`` calls concurrently (e.g. via
+    ``asyncio.gather``) overlaps network I/O and model compute instead of
+    issuing one request at a time.
+    """
+
+    def __init__(self, model: str = "gpt-oss-20b", host: Optional[str] = None):
+        super().__init__(model=model, host=host)
+        self._client_host = host
+        self._client: Optional[ollama.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> ollama.AsyncClient:
+        """Async client bound to the running event loop.
+
+        The underlying httpx pool holds keep-alive connections on the
+        loop that opened them, so a client reused across successive
+        asyncio.run() calls fails with "Event loop is closed".  Rebuild
+        it whenever the running loop changes; within one loop the pooled
+        client is reused as before.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = ollama.AsyncClient(host=self._client_host)
+            self._client_loop = loop
+        return self._client
+
+    async def generate_with_tokens(self, tokens: List[int]):
+        """Async variant of :meth:`LocalInference.generate_with_tokens`."""
+        response = await self.client.generate(
+            model=self.model,
+            prompt=self._render_prompt(tokens),
+            raw=True,
+        )
+        return self._parse_completion(response["response"])
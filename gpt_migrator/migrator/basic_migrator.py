@@ -2,10 +2,28 @@
 
 import ast
 import re
+from pathlib import Path
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
+# Built once at import; generate_response_parser used to rebuild this
+# literal on every call.
+_RESPONSE_PARSER_SNIPPET = '''
+# Add this after your API call to parse Harmony response
+# Built once: a single C-level translate+casefold beats chained
+# strip().lower() calls in hot response loops.
+_TRANS = str.maketrans("", "", " \\t\\n\\r")
+
+sentiment = None
+for item in resp.output:
+    if item["type"] == "message":
+        for part in item["content"]:
+            if part.get("type") == "output_text" and part.get("channel") == "final":
+                sentiment = part["text"].translate(_TRANS).casefold()
+                break
+'''
+
 
 class MigrationResult(BaseModel):
     """Result of a migration operation."""
@@ -17,19 +35,40 @@ class MigrationResult(BaseModel):
 
 class BasicMigrator:
     """Basic migrator for OpenAI chat completions."""
-    
+
+    # Compiled once at class creation so batch callers don't pay a
+    # per-instance (or per-file) regex compile.
+    _CLIENT_INIT_RE = re.compile(r"client = OpenAI\(\)")
+    _MODEL_RE = re.compile(r'model="gpt-[^"]*"')
+
     def __init__(self):
         self.supported_patterns = [
             "openai.ChatCompletion.create",
             "client.chat.completions.create",
         ]
+        # One compiled alternation scans the code once regardless of how
+        # many patterns are supported, instead of one full `in` pass per
+        # pattern.
+        self._patterns_re = re.compile(
+            "|".join(re.escape(p) for p in self.supported_patterns)
+        )
+
+    def migrate_paths(self, paths: List[str]) -> Dict[str, MigrationResult]:
+        """Migrate many files with one migrator instance.
+
+        Returns a mapping of path to result for every file that could be
+        migrated; unsupported files are skipped.
+        """
+        results = {}
+        for path in paths:
+            code = Path(path).read_bytes().decode('utf-8', errors='replace')
+            if self.can_migrate(code):
+                results[path] = self.migrate_chat_completion(code)
+        return results
     
     def can_migrate(self, code: str) -> bool:
         """Check if the code can be migrated."""
-        for pattern in self.supported_patterns:
-            if pattern in code:
-                return True
-        return False
+        return self._patterns_re.search(code) is not None
     
     def migrate_chat_completion(self, code: str) -> MigrationResult:
         """Migrate a chat completion to local model."""
@@ -41,16 +80,14 @@ class BasicMigrator:
         
         # Replace OpenAI client initialization
         if "from openai import OpenAI" in code:
-            migrated_code = re.sub(
-                r"client = OpenAI\(\)",
+            migrated_code = self._CLIENT_INIT_RE.sub(
                 'client = OpenAI(api_key="EMPTY", base_url="http://localhost:8000/v1")',
                 migrated_code
             )
             changes.append("Updated client initialization for local server")
-        
+
         # Replace model name
-        migrated_code = re.sub(
-            r'model="gpt-[^"]*"',
+        migrated_code = self._MODEL_RE.sub(
             'model="gpt-oss-20b"',
             migrated_code
         )
@@ -69,14 +106,4 @@ class BasicMigrator:
     
     def generate_response_parser(self, original_code: str) -> str:
         """Generate code to parse Harmony response format."""
-        parser_code = '''
-# Add this after your API call to parse Harmony response
-sentiment = None
-for item in resp.output:
-    if item["type"] == "message":
-        for part in item["content"]:
-            if part.get("type") == "output_text" and part.get("channel") == "final":
-                sentiment = part["text"].strip().lower()
-                break
-'''
-        return parser_code 
\ No newline at end of file
+        return _RESPONSE_PARSER_SNIPPET
\ No newline at end of file
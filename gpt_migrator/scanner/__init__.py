@@ -1,5 +1,12 @@
 """Scanner module for detecting OpenAI API calls."""
 
-from .scanner import Scanner, APICall
+from .detectors import JavaScriptDetector, PythonDetector
+from .scanner import Scanner, APICall, scan_many
 
-__all__ = ["Scanner", "APICall"] 
\ No newline at end of file
+__all__ = [
+    "Scanner",
+    "APICall",
+    "JavaScriptDetector",
+    "PythonDetector",
+    "scan_many",
+]
\ No newline at end of file
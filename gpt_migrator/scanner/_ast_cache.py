@@ -0,0 +1,43 @@
+"""On-disk AST cache keyed by source content hash.
+
+Re-scans of an unchanged repo (the common CI and interactive case) hit
+the cache for every file and skip ast.parse entirely — unpickling a
+stored tree is much cheaper than reparsing large modules.
+"""
+
+import ast
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Union
+
+# Pickled ASTs are not stable across interpreter versions; bake the
+# version into the filename so upgrades invalidate naturally.
+_VERSION_TAG = "py{}{}".format(*sys.version_info[:2])
+
+
+def get_or_parse(data: bytes, cache_dir: Union[str, Path]) -> ast.Module:
+    """Return the parsed tree for ``data``, via the cache when possible.
+
+    Parse failures propagate as SyntaxError and are never cached.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    path = Path(cache_dir) / f"{digest}-{_VERSION_TAG}.pkl"
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    tree = ast.parse(data)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(tree, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)  # atomic: concurrent scanners never see partials
+    except OSError:
+        tmp.unlink(missing_ok=True)
+    return tree
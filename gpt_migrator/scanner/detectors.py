@@ -0,0 +1,254 @@
+"""Per-language detectors for OpenAI API usage."""
+
+import ast
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+import re
+from typing import Dict, List, Optional
+
+from . import _ast_cache
+
+
+@dataclass(slots=True, frozen=True)
+class APICall:
+    """Represents a detected OpenAI API call.
+
+    A plain slotted dataclass rather than a pydantic model: scans of large
+    repos create thousands of these, and dataclass construction is several
+    times cheaper with a smaller per-instance footprint.
+    """
+    file: str
+    line: int
+    type: str  # 'chat', 'completion', 'embedding', etc.
+    model: Optional[str] = None
+    estimated_tokens: Optional[int] = None
+    complexity: str = "simple"  # 'simple', 'medium', 'complex'
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+# One combined alternation per language, compiled once at import. A
+# single engine pass per file replaces N re.search calls per line (most
+# of which miss); named groups carry the call type out via lastgroup.
+_PY_COMBINED = re.compile(
+    r'(?P<chat>openai\.ChatCompletion\.create\()'
+    r'|(?P<completion>openai\.Completion\.create\()'
+    r'|(?P<embedding>openai\.Embedding\.create\()'
+)
+
+_JS_COMBINED = re.compile(
+    r'(?P<chat>openai\.createChatCompletion\s*\()'
+    r'|(?P<completion>openai\.createCompletion\s*\()'
+    r'|(?P<embedding>openai\.createEmbedding\s*\()'
+    r'|(?P<http>fetch\s*\(\s*["\']https://api\.openai\.com)'
+)
+
+
+def _regex_detect(
+    pattern: "re.Pattern[str]", file_path: str, content: str
+) -> List[APICall]:
+    """Run a combined alternation over whole-file content.
+
+    Line numbers come from bisecting a newline-offset map built once per
+    file, so the file is never split into a per-line list and each match
+    costs O(log n_lines) instead of an O(offset) newline count.
+    """
+    api_calls = []
+    line_starts: Optional[List[int]] = None
+    for match in pattern.finditer(content):
+        if line_starts is None:  # built lazily: most files have no matches
+            line_starts = _line_starts(content)
+        start = match.start()
+        line_num = bisect_right(line_starts, start)
+        line_start = line_starts[line_num - 1]
+        line_end = (
+            line_starts[line_num] - 1
+            if line_num < len(line_starts)
+            else len(content)
+        )
+        api_calls.append(
+            APICall(
+                file=file_path,
+                line=line_num,
+                type=match.lastgroup,
+                complexity=_estimate_line_complexity(content[line_start:line_end])
+            )
+        )
+    return api_calls
+
+
+def _line_starts(content: str) -> List[int]:
+    """Offsets at which each line begins, for bisect-based line lookup."""
+    starts = [0]
+    find = content.find
+    offset = find('\n')
+    while offset != -1:
+        starts.append(offset + 1)
+        offset = find('\n', offset + 1)
+    return starts
+
+
+def _estimate_text_tokens(text: str) -> int:
+    """Rough token estimate (~1.3 per word) for a prompt string.
+
+    Counting separators with str.count keeps this a pair of C loops; a
+    split() here would allocate a list of every word just to take its
+    length. Integer arithmetic avoids float churn in the hot loop.
+    """
+    words = text.count(' ') + text.count('\n') + 1
+    return (words * 13) // 10
+
+
+def _estimate_line_complexity(line: str) -> str:
+    """Estimate the complexity of an API call from its source line."""
+    if 'functions' in line or 'function_call' in line:
+        return 'complex'
+    if 'messages' in line or 'prompt' in line:
+        return 'medium'
+    return 'simple'
+
+
+class PythonDetector:
+    """Detector for OpenAI API calls in Python source."""
+
+    def __init__(self, ast_cache_dir: Optional[str] = None):
+        self.ast_cache_dir = ast_cache_dir
+
+    def detect_calls(self, file_path: str, data: bytes) -> List[APICall]:
+        """Detect calls via the AST, falling back to regex on bad syntax."""
+        try:
+            if self.ast_cache_dir is not None:
+                tree = _ast_cache.get_or_parse(data, self.ast_cache_dir)
+            else:
+                tree = ast.parse(data)
+        except SyntaxError:
+            return self._detect_with_regex(
+                file_path, data.decode('utf-8', errors='replace')
+            )
+        visitor = OpenAIVisitor(file_path)
+        visitor.visit(tree)
+        return visitor.api_calls
+
+    def _detect_with_regex(self, file_path: str, content: str) -> List[APICall]:
+        """Regex fallback for unparseable Python."""
+        return _regex_detect(_PY_COMBINED, file_path, content)
+
+
+class JavaScriptDetector:
+    """Detector for OpenAI API calls in JavaScript/TypeScript source."""
+
+    def detect_calls(self, file_path: str, data: bytes) -> List[APICall]:
+        """Detect SDK calls and raw fetch() hits against the OpenAI API."""
+        content = data.decode('utf-8', errors='replace')
+        return _regex_detect(_JS_COMBINED, file_path, content)
+
+
+# Dotted call path -> call type, so visit_Call resolves the function
+# structure once and dispatches with a dict lookup instead of walking
+# the same Attribute chain in one isinstance ladder per pattern.
+_DOTTED_CALL_TYPES = {
+    'openai.ChatCompletion.create': 'chat',
+    'openai.Completion.create': 'completion',
+    'openai.Embedding.create': 'embedding',
+}
+
+
+def _dotted(node: ast.expr) -> Optional[str]:
+    """Render an Attribute chain like ``openai.Embedding.create`` as a string.
+
+    Returns None when the chain is not rooted in a plain name.
+    """
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+class OpenAIVisitor:
+    """AST walker for detecting OpenAI API calls.
+
+    An explicit-stack walk rather than an ast.NodeVisitor subclass:
+    generic_visit's per-node visit_<Type> method dispatch is pure
+    overhead when only Call nodes matter, and owning the stack keeps
+    the ability to skip matched argument subtrees.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.api_calls: List[APICall] = []
+
+    def visit(self, tree: ast.AST) -> None:
+        """Walk the tree, recording every matching openai.*.create call."""
+        append = self.api_calls.append
+        stack = [tree]
+        pop = stack.pop
+        extend = stack.extend
+        while stack:
+            node = pop()
+            if type(node) is ast.Call:
+                # Most calls are plain foo(...); an exact-type check on
+                # func and the shared 'create' discriminator bail out
+                # before any dotted string gets built.
+                func = node.func
+                if type(func) is ast.Attribute and func.attr == 'create':
+                    call_type = _DOTTED_CALL_TYPES.get(_dotted(func))
+                    if call_type is not None:
+                        model, tokens, complexity = self._scan_keywords(node)
+                        append(
+                            APICall(
+                                file=self.file_path,
+                                line=node.lineno,
+                                type=call_type,
+                                model=model,
+                                estimated_tokens=tokens,
+                                complexity=complexity
+                            )
+                        )
+                        # Don't descend into the matched call's argument
+                        # subtree: openai calls never nest inside a
+                        # create(...) literal, and a chat call's messages
+                        # list alone can be hundreds of nodes.
+                        continue
+            # Reversed so pops come off in source order and calls are
+            # recorded top-to-bottom as the recursive visitor did.
+            extend(reversed(list(ast.iter_child_nodes(node))))
+
+    @staticmethod
+    def _scan_keywords(node: ast.Call):
+        """One pass over the call's keywords for model, tokens, complexity.
+
+        Fuses what used to be three separate keyword loops (model
+        extraction, token estimation, complexity scoring) into a single
+        iteration.  ast.Str is a deprecated (and slower) ast.Constant
+        wrapper on 3.12+; the model match tests the Constant directly.
+        """
+        model = None
+        tokens = 0
+        has_functions = False
+        has_messages = False
+        for kw in node.keywords:
+            arg = kw.arg
+            value = kw.value
+            if arg == 'model':
+                if isinstance(value, ast.Constant) and isinstance(value.value, str):
+                    model = value.value
+            elif arg == 'functions':
+                has_functions = True
+            elif arg == 'messages' or arg == 'prompt':
+                has_messages = True
+            for sub in ast.walk(value):
+                if type(sub) is ast.Constant and isinstance(sub.value, str):
+                    tokens += _estimate_text_tokens(sub.value)
+        if has_functions:
+            complexity = 'complex'
+        elif has_messages:
+            complexity = 'medium'
+        else:
+            complexity = 'simple'
+        return model, tokens or None, complexity
@@ -1,157 +1,217 @@
 """Scanner module for detecting OpenAI API calls."""
 
-import ast
+import fnmatch
+import mmap
+import os
 import re
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain
+from typing import Iterator, List, Optional
 
-from pydantic import BaseModel
+from .detectors import APICall, JavaScriptDetector, OpenAIVisitor, PythonDetector
 
+# Byte-level pre-filter: files with no OpenAI references (the common case)
+# are rejected by one DFA pass instead of paying for a full AST parse.
+_PREFILTER_PATTERN = re.compile(
+    rb'openai\.(ChatCompletion|Completion|Embedding)\.create'
+    rb'|openai\.OpenAI\('
+    rb'|openai\.create(ChatCompletion|Completion|Embedding)'
+    rb'|\.chat\.completions\.create'
+    rb'|api\.openai\.com'
+    rb'|import\s+openai'
+    rb'|from\s+openai\s+import'
+)
 
-class APICall(BaseModel):
-    """Represents a detected OpenAI API call."""
-    file: str
-    line: int
-    type: str  # 'chat', 'completion', 'embedding', etc.
-    model: Optional[str] = None
-    estimated_tokens: Optional[int] = None
-    complexity: str = "simple"  # 'simple', 'medium', 'complex'
 
-    def to_dict(self) -> Dict:
-        """Convert to dictionary."""
-        return {
-            "file": self.file,
-            "line": self.line,
-            "type": self.type,
-            "model": self.model,
-            "estimated_tokens": self.estimated_tokens,
-            "complexity": self.complexity,
-        }
+# Detectors are stateless (per-call state lives in the visitor), so one
+# instance of each serves every Scanner in the process; .js and .ts now
+# share a single JavaScriptDetector instead of getting one apiece.
+_PY_DETECTOR = PythonDetector()
+_JS_DETECTOR = JavaScriptDetector()
+_DETECTORS = {'.py': _PY_DETECTOR, '.js': _JS_DETECTOR, '.ts': _JS_DETECTOR}
+_SCAN_EXTS = frozenset(_DETECTORS)
+
+# Directories never worth descending into; pruning them at the walk
+# saves the whole subtree (node_modules alone can dwarf the repo).
+_PRUNE_DIRS = frozenset({'node_modules', '.git', 'venv', '__pycache__'})
+
+# Above this size, prefilter through mmap so rejected files (the common
+# case) never get copied into a Python bytes object at all.
+_MMAP_THRESHOLD = 1 << 20
 
 
 class Scanner:
     """Scanner for detecting OpenAI API calls in code."""
-    
-    def __init__(self):
+
+    def __init__(self, ast_cache_dir: Optional[str] = None,
+                 exclude_patterns: Optional[List[str]] = None):
         self.api_calls: List[APICall] = []
-    
+        # All glob excludes fold into one compiled alternation matched
+        # once per file; fnmatch.translate gives correct glob semantics
+        # (a naive "*" -> ".*" rewrite does not).
+        if exclude_patterns:
+            self._exclude_re = re.compile(
+                "|".join(fnmatch.translate(p) for p in exclude_patterns)
+            )
+        else:
+            self._exclude_re = None
+        if ast_cache_dir is None:
+            self.detectors = _DETECTORS
+        else:
+            # A cache dir is per-scan state, so that one gets its own
+            # Python detector.
+            self.detectors = {
+                **_DETECTORS,
+                '.py': PythonDetector(ast_cache_dir=ast_cache_dir),
+            }
+
     def scan_file(self, file_path: str) -> List[APICall]:
         """Scan a single file for OpenAI API calls."""
+        self.api_calls.extend(self._scan_file(file_path))
+        return self.api_calls
+
+    @classmethod
+    def _read_prefiltered(cls, file_path: str) -> Optional[bytes]:
+        """Read a file's bytes, or None when the prefilters reject it.
+
+        Large files run both prefilters against an mmap view — the kernel
+        page cache backs the scan and rejected files are never copied
+        into a bytes object.  The cheapest rejection runs first: every
+        prefilter pattern requires the literal "openai", so a C-level
+        substring scan (memchr-backed) throws out the overwhelming
+        majority of files before the regex.
+        """
+        fd = os.open(file_path, os.O_RDONLY)
         try:
-            with open(file_path, 'r') as f:
-                content = f.read()
-            
-            # Try AST parsing first
-            try:
-                tree = ast.parse(content)
-                visitor = OpenAIVisitor(file_path)
-                visitor.visit(tree)
-                self.api_calls.extend(visitor.api_calls)
-            except SyntaxError:
-                # Fallback to regex if not valid Python
-                self._scan_with_regex(file_path, content)
-            
-            return self.api_calls
+            size = os.fstat(fd).st_size
+            if size > _MMAP_THRESHOLD:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(b'openai') == -1:
+                        return None
+                    if _PREFILTER_PATTERN.search(mm) is None:
+                        return None
+                    return mm[:]
+
+            data = os.read(fd, size)
+            # A single read covers regular files; loop only if short-read
+            while len(data) < size:
+                chunk = os.read(fd, size - len(data))
+                if not chunk:
+                    break
+                data += chunk
+        finally:
+            os.close(fd)
+
+        if b'openai' not in data or _PREFILTER_PATTERN.search(data) is None:
+            return None
+        return data
+
+    def _scan_file(self, file_path: str) -> List[APICall]:
+        """Scan one file and return its API calls."""
+        try:
+            data = self._read_prefiltered(file_path)
+            if data is None:
+                return []
+
+            ext = os.path.splitext(file_path)[1]
+            detector = self.detectors.get(ext) or self.detectors['.py']
+            return detector.detect_calls(file_path, data)
         except Exception as e:
             print(f"Error scanning {file_path}: {str(e)}")
             return []
-    
-    def scan_directory(self, directory: str) -> List[APICall]:
-        """Scan a directory recursively for OpenAI API calls."""
-        path = Path(directory)
-        for file in path.rglob("*"):
-            if file.is_file() and file.suffix in ['.py', '.js', '.ts']:
-                self.scan_file(str(file))
+
+    #: Source file extensions the scanner understands.
+    SOURCE_SUFFIXES = tuple(_DETECTORS)
+
+    def _iter_source_files(self, root: str) -> Iterator[str]:
+        """Walk a tree with os.scandir, yielding source file paths.
+
+        scandir reuses the stat information returned by the directory read,
+        avoiding the extra stat() per entry (and per-entry Path object) that
+        a pathlib rglob pays.  Exclude patterns match against the path
+        relative to ``root``.
+        """
+        exclude = self._exclude_re
+        base_len = len(root.rstrip(os.sep)) + 1
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in _PRUNE_DIRS:
+                                stack.append(entry.path)
+                        elif entry.name.endswith(self.SOURCE_SUFFIXES) and entry.is_file():
+                            if exclude is not None and exclude.match(
+                                entry.path[base_len:]
+                            ):
+                                continue
+                            yield entry.path
+            except OSError:
+                continue
+
+    def iter_calls(
+        self, directory: str, parallel: bool = True
+    ) -> Iterator[APICall]:
+        """Yield OpenAI API calls found under a directory as they are scanned.
+
+        Scanning is I/O-bound on file reads, so files are fanned out over a
+        thread pool by default; pass ``parallel=False`` for deterministic
+        single-threaded debugging.  Consumers get calls as each file
+        finishes instead of waiting for the whole tree.
+        """
+        files = list(self._iter_source_files(str(directory)))
+        if parallel and len(files) > 1:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                yield from chain.from_iterable(
+                    executor.map(self._scan_file, files)
+                )
+        else:
+            for file in files:
+                yield from self._scan_file(file)
+
+    def scan_directory(self, directory: str, parallel: bool = True,
+                       processes: bool = False) -> List[APICall]:
+        """Scan a directory recursively for OpenAI API calls.
+
+        List-returning wrapper around :meth:`iter_calls`.  With
+        ``processes=True`` files are fanned out over a process pool via
+        :func:`scan_many` instead, which scales the CPU-bound AST work
+        past the GIL on multi-core machines.
+        """
+        if processes:
+            files = list(self._iter_source_files(str(directory)))
+            self.api_calls.extend(scan_many(files))
+        else:
+            self.api_calls.extend(self.iter_calls(directory, parallel=parallel))
         return self.api_calls
-    
-    def _scan_with_regex(self, file_path: str, content: str):
-        """Scan using regex patterns."""
-        patterns = [
-            (r'openai\.ChatCompletion\.create\(', 'chat'),
-            (r'openai\.Completion\.create\(', 'completion'),
-            (r'openai\.Embedding\.create\(', 'embedding'),
-        ]
-        
-        for line_num, line in enumerate(content.split('\n'), 1):
-            for pattern, call_type in patterns:
-                if re.search(pattern, line):
-                    self.api_calls.append(
-                        APICall(
-                            file=file_path,
-                            line=line_num,
-                            type=call_type,
-                            complexity=self._estimate_complexity(line)
-                        )
-                    )
-    
-    def _estimate_complexity(self, line: str) -> str:
-        """Estimate the complexity of an API call."""
-        if 'functions' in line or 'function_call' in line:
-            return 'complex'
-        if 'messages' in line or 'prompt' in line:
-            return 'medium'
-        return 'simple'
-
-
-class OpenAIVisitor(ast.NodeVisitor):
-    """AST visitor for detecting OpenAI API calls."""
-    
-    def __init__(self, file_path: str):
-        self.file_path = file_path
-        self.api_calls: List[APICall] = []
-    
-    def visit_Call(self, node: ast.Call):
-        """Visit a function call node."""
-        # Check for openai.XXX.create() patterns
-        if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Attribute):
-            if hasattr(node.func.value.value, 'id') and node.func.value.value.id == 'openai':
-                service = node.func.value.attr
-                method = node.func.attr
-                
-                if method == 'create':
-                    call_type = self._get_call_type(service)
-                    if call_type:
-                        self.api_calls.append(
-                            APICall(
-                                file=self.file_path,
-                                line=node.lineno,
-                                type=call_type,
-                                model=self._extract_model(node),
-                                complexity=self._estimate_complexity(node)
-                            )
-                        )
-        
-        self.generic_visit(node)
-    
-    def _get_call_type(self, service: str) -> Optional[str]:
-        """Get the type of API call from the service name."""
-        mapping = {
-            'ChatCompletion': 'chat',
-            'Completion': 'completion',
-            'Embedding': 'embedding',
-        }
-        return mapping.get(service)
-    
-    def _extract_model(self, node: ast.Call) -> Optional[str]:
-        """Extract the model name from the API call."""
-        for kw in node.keywords:
-            if kw.arg == 'model' and isinstance(kw.value, ast.Str):
-                return kw.value.s
-        return None
-    
-    def _estimate_complexity(self, node: ast.Call) -> str:
-        """Estimate the complexity of an API call from its AST."""
-        has_functions = False
-        has_messages = False
-        
-        for kw in node.keywords:
-            if kw.arg == 'functions':
-                has_functions = True
-            elif kw.arg == 'messages' or kw.arg == 'prompt':
-                has_messages = True
-        
-        if has_functions:
-            return 'complex'
-        if has_messages:
-            return 'medium'
-        return 'simple'
\ No newline at end of file
+
+
+def _scan_one(file_path: str) -> List[APICall]:
+    """Scan a single file in a worker process.
+
+    Top-level (not a method) so it pickles cleanly to pool workers; each
+    worker builds its own throwaway Scanner.
+    """
+    return Scanner()._scan_file(file_path)
+
+
+def scan_many(paths: List[str]) -> List[APICall]:
+    """Scan many files across a process pool.
+
+    AST parsing is CPU-bound, so for large file lists a process pool
+    sidesteps the GIL and scales with cores where the thread pool in
+    :meth:`Scanner.iter_calls` cannot.
+    """
+    # Chunk so each worker gets a few amortized batches rather than one
+    # IPC round-trip per file.
+    chunksize = max(1, len(paths) // (4 * (os.cpu_count() or 1)))
+    with ProcessPoolExecutor() as executor:
+        return list(
+            chain.from_iterable(
+                executor.map(_scan_one, paths, chunksize=chunksize)
+            )
+        )
+
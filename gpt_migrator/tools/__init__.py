@@ -0,0 +1,5 @@
+"""Tools exposed to the model through the Harmony commentary channel."""
+
+from .registry import BaseTool, CalculatorTool, TimeTool, ToolRegistry
+
+__all__ = ["BaseTool", "CalculatorTool", "TimeTool", "ToolRegistry"]
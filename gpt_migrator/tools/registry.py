@@ -0,0 +1,223 @@
+"""Tool registry for Harmony commentary-channel tool calls."""
+
+import ast
+import hashlib
+import operator
+import threading
+from datetime import datetime as _datetime
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
+
+import orjson
+
+
+class BaseTool:
+    """Base class for tools exposed to the model."""
+
+    name: str = ""
+    description: str = ""
+    #: Whether repeated calls with identical arguments may be served from
+    #: the registry's result cache.  Leave False for tools whose output
+    #: depends on anything beyond their arguments (time, randomness, I/O).
+    can_memoize: bool = False
+
+    def execute(self, **kwargs: Any) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+# Restricted arithmetic evaluator: no eval(), so expressions can't reach
+# builtins, and an AST walk over numeric nodes is far cheaper than a full
+# compile per call.
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+_ALLOWED_CALLS = {"abs": abs, "round": round, "min": min, "max": max}
+
+
+@lru_cache(maxsize=512)
+def _compile_expr(expression: str) -> ast.Expression:
+    return ast.parse(expression, mode="eval")
+
+
+def _eval_node(node: ast.expr) -> float:
+    node_type = type(node)
+    if node_type is ast.Constant:
+        if isinstance(node.value, (int, float)):
+            return node.value
+        raise ValueError(f"non-numeric constant: {node.value!r}")
+    if node_type is ast.BinOp:
+        op = _BIN_OPS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"unsupported operator: {type(node.op).__name__}")
+        return op(_eval_node(node.left), _eval_node(node.right))
+    if node_type is ast.UnaryOp:
+        op = _UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"unsupported operator: {type(node.op).__name__}")
+        return op(_eval_node(node.operand))
+    if node_type is ast.Call:
+        func = node.func
+        if (type(func) is ast.Name and func.id in _ALLOWED_CALLS
+                and not node.keywords):
+            return _ALLOWED_CALLS[func.id](
+                *(_eval_node(arg) for arg in node.args)
+            )
+        raise ValueError("only abs/round/min/max calls are allowed")
+    raise ValueError(f"unsupported expression element: {node_type.__name__}")
+
+
+@lru_cache(maxsize=512)
+def _evaluate(expression: str) -> float:
+    """Evaluate a pure arithmetic expression, cached per string.
+
+    Agent loops resend identical expressions; the second call is a dict
+    lookup with no parse or walk at all.
+    """
+    return _eval_node(_compile_expr(expression).body)
+
+
+class CalculatorTool(BaseTool):
+    """Evaluate an arithmetic expression."""
+
+    name = "calculator"
+    description = "Evaluate an arithmetic expression and return the result."
+    can_memoize = True
+
+    def execute(self, expression: str = "", **kwargs: Any) -> Dict[str, Any]:
+        try:
+            result = _evaluate(expression)
+        except (SyntaxError, ValueError, TypeError, ZeroDivisionError) as exc:
+            return {"success": False, "error": str(exc)}
+        return {"success": True, "result": result}
+
+
+class TimeTool(BaseTool):
+    """Report the current local date and time."""
+
+    name = "time"
+    description = "Get the current local date and time."
+    #: Pre-bound so each call is one C-level invocation with no module
+    #: or attribute lookup on the hot path.
+    _now = _datetime.now
+
+    def execute(self, **kwargs: Any) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "result": self._now().isoformat(timespec="seconds"),
+        }
+
+
+class _ToolEntry(NamedTuple):
+    tool: BaseTool
+    can_memoize: bool
+    #: ``tool.execute`` bound at registration, so the hot dispatch path
+    #: is one tuple-field load and a C-level call with no per-invocation
+    #: attribute lookup.
+    run: Any
+
+
+#: Bound on the memo cache; agent loops can revisit many distinct
+#: argument sets over a long session.
+_MEMO_MAX = 1024
+
+#: Bound on the negative-lookup cache of prebuilt "not found" errors.
+_MISSING_MAX = 128
+
+
+class ToolRegistry:
+    """Registry of tools with opt-in result memoization.
+
+    Agent loops frequently re-ask the same tool question; for tools that
+    declare themselves memoizable, a repeat call with identical arguments
+    is served from the cache without running the tool body.  Error
+    results are never cached so transient failures stay retryable.
+
+    The tool table is published as an immutable snapshot: ``register``
+    copies it under a lock and swaps in a new read-only mapping, so
+    lookups from concurrent scan threads read the current snapshot with
+    no lock and never observe a half-updated dict.
+    """
+
+    def __init__(self, register_defaults: bool = True):
+        self._tools: Mapping[str, _ToolEntry] = MappingProxyType({})
+        self._registry_lock = threading.Lock()
+        self._memo: Dict[tuple, Dict[str, Any]] = {}
+        self._memo_lock = threading.Lock()
+        # Models that hallucinate a tool name tend to retry it verbatim;
+        # keep the prebuilt exception so repeat misses skip string
+        # formatting and exception construction.
+        self._missing: Dict[str, ValueError] = {}
+        if register_defaults:
+            self.register(CalculatorTool())
+            self.register(TimeTool())
+
+    def register(self, tool: BaseTool,
+                 can_memoize: Optional[bool] = None) -> None:
+        """Register a tool, optionally overriding its memoization flag."""
+        if can_memoize is None:
+            can_memoize = tool.can_memoize
+        with self._registry_lock:
+            tools = dict(self._tools)
+            tools[tool.name] = _ToolEntry(tool, can_memoize, tool.execute)
+            self._tools = MappingProxyType(tools)
+            self._missing.pop(tool.name, None)
+
+    def get(self, name: str) -> Optional[BaseTool]:
+        """Look up a registered tool by name."""
+        entry = self._tools.get(name)
+        return entry.tool if entry is not None else None
+
+    def list_tools(self) -> List[str]:
+        """Names of all registered tools."""
+        return list(self._tools)
+
+    @staticmethod
+    def _memo_key(name: str, kwargs: Dict[str, Any]) -> tuple:
+        digest = hashlib.sha256(
+            orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS, default=str)
+        ).hexdigest()
+        return (name, digest)
+
+    def execute(self, name: str, **kwargs: Any) -> Dict[str, Any]:
+        """Run a tool by name, serving memoizable repeats from cache."""
+        entry = self._tools.get(name)
+        if entry is None:
+            exc = self._missing.get(name)
+            if exc is None:
+                exc = ValueError(f"Tool '{name}' not found")
+                with self._registry_lock:
+                    if len(self._missing) >= _MISSING_MAX:
+                        self._missing.pop(next(iter(self._missing)))
+                    self._missing[name] = exc
+            raise exc
+        if not entry.can_memoize:
+            return entry.run(**kwargs)
+
+        key = self._memo_key(name, kwargs)
+        with self._memo_lock:
+            cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        result = entry.run(**kwargs)
+        if result.get("success", True):
+            with self._memo_lock:
+                if len(self._memo) >= _MEMO_MAX:
+                    self._memo.pop(next(iter(self._memo)))
+                self._memo[key] = result
+        return result
+
+    def clear_memo_cache(self) -> None:
+        """Drop memoized results (call at session boundaries)."""
+        with self._memo_lock:
+            self._memo.clear()
@@ -0,0 +1,27 @@
+"""Shared filesystem and git helpers."""
+
+from .file_utils import (
+    backup_file,
+    restore_file,
+    write_converted_code,
+    write_converted_code_batch,
+)
+from .git_utils import (
+    clone_repo,
+    create_pr,
+    get_git_status,
+    get_repo_info,
+    is_git_repo,
+)
+
+__all__ = [
+    "backup_file",
+    "restore_file",
+    "write_converted_code",
+    "write_converted_code_batch",
+    "clone_repo",
+    "create_pr",
+    "get_git_status",
+    "get_repo_info",
+    "is_git_repo",
+]
@@ -0,0 +1,193 @@
+"""Filesystem helpers for migration backups and converted output."""
+
+import errno
+import os
+import shutil
+import stat as stat_module
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+#: One-shot request size for in-kernel copies; the kernel clamps to the
+#: actual remaining byte count.
+_COPY_CHUNK = 1 << 30
+
+
+def _fast_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Copy ``src`` to ``dst`` without moving bytes through userspace.
+
+    Prefers os.copy_file_range (in-kernel, and O(1) metadata on
+    reflink-capable filesystems), then os.sendfile, then a buffered
+    copyfileobj loop as the portable fallback.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+
+        if hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK):
+                    pass
+                return
+            except OSError as exc:
+                if exc.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL):
+                    raise
+
+        if hasattr(os, "sendfile"):
+            try:
+                offset = 0
+                while True:
+                    sent = os.sendfile(dst_fd, src_fd, offset, _COPY_CHUNK)
+                    if sent == 0:
+                        return
+                    offset += sent
+            except OSError:
+                pass
+
+        fsrc.seek(0)
+        fdst.seek(0)
+        fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, 1 << 20)
+
+
+def backup_file(file_path: Union[str, Path], suffix: str = ".backup",
+                hardlink: bool = False, full_metadata: bool = False) -> Path:
+    """Copy a file alongside itself before the migrator rewrites it.
+
+    Re-runs over an unchanged file skip the copy: the previous backup
+    carries the source's size and mtime (copystat), so a match on both
+    means the content is already backed up.
+
+    With ``hardlink=True`` the backup is a link to the source — O(1)
+    regardless of file size, zero bytes copied.  That is only safe when
+    the source will never be rewritten in place (a write through the
+    link would mutate the backup too); write_converted_code qualifies
+    because it swaps in a new inode via os.replace, which breaks the
+    link.  Cross-device and permission failures fall back to a copy.
+
+    Only mode and timestamps are carried over by default — that's what
+    the unchanged-source check reads and what restore cares about.
+    ``full_metadata=True`` restores copystat's complete fidelity (flags,
+    xattrs), at a few extra syscalls per attribute.
+    """
+    file_path = Path(file_path)
+    backup_path = file_path.with_name(file_path.name + suffix)
+    if backup_path.exists():
+        src_stat = file_path.stat()
+        bak_stat = backup_path.stat()
+        if (src_stat.st_size == bak_stat.st_size
+                and src_stat.st_mtime_ns == bak_stat.st_mtime_ns):
+            return backup_path
+        backup_path.unlink()
+    if hardlink:
+        try:
+            os.link(file_path, backup_path)
+        except OSError as exc:
+            if exc.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+        else:
+            # Same inode: metadata is already identical, nothing to copy.
+            return backup_path
+    _fast_copy(file_path, backup_path)
+    if full_metadata:
+        shutil.copystat(file_path, backup_path)
+    else:
+        st = os.stat(file_path)
+        os.utime(backup_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.chmod(backup_path, stat_module.S_IMODE(st.st_mode))
+    return backup_path
+
+
+def restore_file(file_path: Union[str, Path], suffix: str = ".backup") -> bool:
+    """Restore a file from its backup; returns False when none exists."""
+    file_path = Path(file_path)
+    backup_path = file_path.with_name(file_path.name + suffix)
+    if not backup_path.exists():
+        return False
+    # A still-hardlinked backup means the source was never rewritten;
+    # truncating the shared inode would destroy both copies.
+    if (file_path.exists()
+            and os.path.samestat(os.stat(backup_path), os.stat(file_path))):
+        return True
+    _fast_copy(backup_path, file_path)
+    shutil.copystat(backup_path, file_path)
+    return True
+
+
+def write_converted_code(
+    target_path: Union[str, Path],
+    converted_code: str,
+    output_dir: Optional[Union[str, Path]] = None,
+    preserve_backup: bool = True,
+) -> Path:
+    """Write converted source, backing up an in-place target first.
+
+    With ``output_dir`` set the original is left untouched and the
+    converted file lands there under the same name.
+    """
+    target_path = Path(target_path)
+    if output_dir is not None:
+        out_path = Path(output_dir) / target_path.name
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        out_path = target_path
+        if preserve_backup and out_path.exists():
+            backup_file(out_path, hardlink=True)
+
+    # Encode once and stage through a temp file in the same directory:
+    # one buffer, one write syscall, and os.replace makes the new content
+    # visible atomically — a crash never leaves a half-written module.
+    data = converted_code.encode("utf-8")
+    # mkstemp creates the file 0600; give it the mode the target should
+    # keep (the existing file's, or the regular creation default) before
+    # the rename so the swap doesn't clobber permissions.
+    try:
+        mode = stat_module.S_IMODE(os.stat(out_path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    fd, tmp_path = tempfile.mkstemp(dir=out_path.parent, prefix=".tmp_")
+    try:
+        os.write(fd, data)
+        os.fsync(fd)
+        os.fchmod(fd, mode)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+    os.close(fd)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def write_converted_code_batch(
+    items: Iterable[Tuple[Union[str, Path], str]],
+    output_dir: Optional[Union[str, Path]] = None,
+    preserve_backup: bool = True,
+) -> List[Path]:
+    """Write many converted files concurrently, preserving input order.
+
+    File I/O releases the GIL, so a thread pool overlaps the backup,
+    temp-file, and rename syscalls across files instead of paying them
+    serially. Parent directories are created up front, deduplicated, so
+    the workers never race on mkdir.
+    """
+    items = list(items)
+    if not items:
+        return []
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+    else:
+        for parent in {Path(target).parent for target, _ in items}:
+            parent.mkdir(parents=True, exist_ok=True)
+
+    max_workers = min(32, (os.cpu_count() or 1) * 4, len(items))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(
+            lambda item: write_converted_code(
+                item[0], item[1], output_dir, preserve_backup
+            ),
+            items,
+        ))
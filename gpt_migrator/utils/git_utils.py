@@ -0,0 +1,325 @@
+"""Git helpers built on direct .git reads with subprocess fallbacks."""
+
+import atexit
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+#: Known checkout roots, FIFO-bounded. Only positive results are cached:
+#: a directory that wasn't a repo can become one (clone_repo, git init)
+#: at any time, so misses must re-stat.
+_repo_cache: Dict[str, bool] = {}
+_REPO_CACHE_MAX = 512
+
+
+def is_git_repo(path: Union[str, Path]) -> bool:
+    """Whether ``path`` is the root of a git checkout.
+
+    Positive results are cached per path string: scans revisit the same
+    roots constantly and checkouts don't stop being checkouts mid-run.
+    """
+    key = str(path)
+    if key in _repo_cache:
+        return True
+    if os.path.exists(os.path.join(key, ".git")):
+        if len(_repo_cache) >= _REPO_CACHE_MAX:
+            _repo_cache.pop(next(iter(_repo_cache)))
+        _repo_cache[key] = True
+        return True
+    return False
+
+
+def _git(repo_path: Union[str, Path], *args: str) -> Optional[str]:
+    """Run one git command, returning stripped stdout or None on failure."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_path), *args],
+            capture_output=True, text=True, timeout=30,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+class _GitSession:
+    """Long-lived ``git cat-file --batch-check`` process for one repo.
+
+    One fork+exec amortized over every ref or object query against the
+    repo; git keeps its object database warm between queries.
+    """
+
+    def __init__(self, repo_path: Path):
+        self._lock = threading.Lock()
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(repo_path), "cat-file", "--batch-check"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+
+    def query(self, ref: str) -> Optional[str]:
+        """Resolve a ref or object name to its object id, or None."""
+        with self._lock:
+            try:
+                self._proc.stdin.write(ref + "\n")
+                self._proc.stdin.flush()
+                line = self._proc.stdout.readline()
+            except (OSError, ValueError):
+                return None
+        parts = line.split()
+        if len(parts) < 2 or parts[1] in ("missing", "ambiguous"):
+            return None
+        return parts[0]
+
+    def close(self) -> None:
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=5)
+        except (OSError, subprocess.SubprocessError, ValueError):
+            self._proc.kill()
+
+
+_sessions: Dict[str, _GitSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def _session_for(repo_path: Path) -> _GitSession:
+    key = str(repo_path)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = _GitSession(repo_path)
+        return session
+
+
+@atexit.register
+def _close_sessions() -> None:
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def resolve_ref(repo_path: Union[str, Path], ref: str) -> Optional[str]:
+    """Object id for a ref, via the repo's persistent git session."""
+    return _session_for(Path(repo_path)).query(ref)
+
+
+def _origin_url(config_path: Path) -> Optional[str]:
+    """Pull the origin URL out of .git/config.
+
+    Hand-rolled because configparser rejects git's tab-indented option
+    lines as continuations.
+    """
+    in_origin = False
+    for line in config_path.read_text().splitlines():
+        stripped = line.strip()
+        if stripped.startswith("["):
+            in_origin = stripped == '[remote "origin"]'
+        elif in_origin and stripped.startswith("url"):
+            _, _, value = stripped.partition("=")
+            return value.strip()
+    return None
+
+
+def _read_repo_info_from_git_dir(repo_path: Path) -> Dict[str, Optional[str]]:
+    git_dir = repo_path / ".git"
+    head = (git_dir / "HEAD").read_text().strip()
+    branch: Optional[str] = None
+    commit: Optional[str] = None
+    if head.startswith("ref: "):
+        ref = head[5:]
+        branch = ref.rsplit("refs/heads/", 1)[-1]
+        ref_file = git_dir / ref
+        if ref_file.exists():
+            commit = ref_file.read_text().strip()
+        else:
+            packed = git_dir / "packed-refs"
+            if packed.exists():
+                suffix = " " + ref
+                for line in packed.read_text().splitlines():
+                    if line.endswith(suffix):
+                        commit = line.split(" ", 1)[0]
+                        break
+        if commit is None:
+            # Ref layouts the direct read doesn't cover (e.g. reftable);
+            # ask the repo's persistent git session rather than forking.
+            commit = resolve_ref(repo_path, "HEAD")
+    else:
+        commit = head  # detached HEAD
+    return {
+        "remote_url": _origin_url(git_dir / "config"),
+        "branch": branch,
+        "commit": commit,
+    }
+
+
+def get_repo_info(repo_path: Union[str, Path]) -> Dict[str, Optional[str]]:
+    """Remote URL, current branch, and HEAD commit for a checkout.
+
+    Reads .git directly — a single fork+exec of git costs more than all
+    three file reads together — and falls back to git itself for layouts
+    the direct path doesn't understand (worktrees, submodule gitfiles).
+    """
+    repo_path = Path(repo_path)
+    try:
+        return _read_repo_info_from_git_dir(repo_path)
+    except OSError:
+        # Launch all three queries before waiting on any, so the process
+        # startups overlap instead of paying three serial fork+execs.
+        procs = {}
+        for key, args in (
+            ("remote_url", ("remote", "get-url", "origin")),
+            ("branch", ("branch", "--show-current")),
+            ("commit", ("rev-parse", "HEAD")),
+        ):
+            try:
+                procs[key] = subprocess.Popen(
+                    ["git", "-C", str(repo_path), *args],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                )
+            except OSError:
+                procs[key] = None
+        info: Dict[str, Optional[str]] = {}
+        for key, proc in procs.items():
+            if proc is None:
+                info[key] = None
+                continue
+            stdout, _ = proc.communicate()
+            info[key] = stdout.strip() if proc.returncode == 0 else None
+        return info
+
+
+#: Status results keyed by repo path, invalidated on .git mtime change.
+#: Ref updates, index writes, and commits all land via lock-file renames
+#: inside .git, which bump the directory mtime.
+_status_cache: Dict[str, tuple] = {}
+
+
+def get_git_status(repo_path: Union[str, Path]) -> Dict[str, object]:
+    """Branch name and changed paths from one git invocation.
+
+    ``status --porcelain=v2 --branch`` reports both in a single process
+    instead of separate status and branch calls, and repeat queries with
+    an untouched ``.git`` are served from a per-path cache.
+    """
+    repo_path = Path(repo_path)
+    key = str(repo_path)
+    try:
+        mtime = os.stat(repo_path / ".git").st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    cached = _status_cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    output = _git(repo_path, "status", "--porcelain=v2", "--branch")
+    if output is None:
+        return {}
+    branch: Optional[str] = None
+    changes: List[str] = []
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            branch = line[len("# branch.head "):]
+        elif line.startswith(("1 ", "u ")):
+            changes.append(line.split(" ", 8)[8])
+        elif line.startswith("2 "):
+            changes.append(line.split(" ", 9)[9].split("\t", 1)[0])
+        elif line.startswith("? "):
+            changes.append(line[2:])
+    status = {"branch": branch, "changes": changes, "clean": not changes}
+    # Re-stat after the call: git status may itself refresh the index,
+    # which lands via a lock-file rename and bumps the .git mtime.
+    try:
+        mtime = os.stat(repo_path / ".git").st_mtime_ns
+    except FileNotFoundError:
+        return status
+    _status_cache[key] = (mtime, status)
+    return status
+
+
+def clone_repo(
+    repo_url: str,
+    target_path: Union[str, Path],
+    *,
+    depth: Optional[int] = 1,
+    filter_blobs: bool = True,
+    recurse_submodules: bool = False,
+    jobs: Optional[int] = None,
+) -> bool:
+    """Clone a repository; returns True on success.
+
+    The default clone is shallow (``depth=1``, single branch) and
+    blob-filtered: scanning only needs the checked-out tree, and history
+    plus unreferenced blobs dominate bytes on the wire for mature repos.
+    Submodules are skipped unless requested; when they are fetched,
+    ``--jobs`` fans them out across cores.  Callers that need full
+    history must pass ``depth=None``.
+    """
+    argv = ["git", "clone"]
+    if depth is not None:
+        argv += ["--depth", str(depth), "--single-branch"]
+    if filter_blobs:
+        argv.append("--filter=blob:none")
+    if recurse_submodules:
+        argv += [
+            "--recurse-submodules",
+            f"--jobs={jobs or os.cpu_count() or 1}",
+        ]
+    argv += [repo_url, str(target_path)]
+    try:
+        result = subprocess.run(argv, capture_output=True, text=True)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0
+
+
+def _create_pr_in_process(pygit2, repo_path: Path, branch_name: str,
+                          title: str) -> bool:
+    """Branch, stage, and commit via libgit2; only the push forks git."""
+    repo = pygit2.Repository(str(repo_path))
+    head_commit = repo[repo.head.target]
+    branch = repo.branches.local.create(branch_name, head_commit)
+    repo.checkout(branch)
+    repo.index.add_all()
+    repo.index.write()
+    tree = repo.index.write_tree()
+    signature = repo.default_signature
+    repo.create_commit("HEAD", signature, signature, title, tree,
+                       [head_commit.id])
+    return _git(repo_path, "push", "-u", "origin", branch_name) is not None
+
+
+def create_pr(repo_path: Union[str, Path], branch_name: str, title: str) -> bool:
+    """Branch, stage, commit, and push the current changes.
+
+    With pygit2 installed the branch/stage/commit steps run in-process
+    against libgit2, leaving a single subprocess for the push; otherwise
+    each step forks git.
+    """
+    repo_path = Path(repo_path)
+    try:
+        import pygit2
+    except ImportError:
+        pygit2 = None
+    if pygit2 is not None:
+        try:
+            return _create_pr_in_process(pygit2, repo_path, branch_name, title)
+        except (KeyError, pygit2.GitError):
+            return False
+
+    for args in (
+        ("checkout", "-b", branch_name),
+        ("add", "-A"),
+        ("commit", "-m", title),
+        ("push", "-u", "origin", branch_name),
+    ):
+        if _git(repo_path, *args) is None:
+            return False
+    return True
@@ -0,0 +1,244 @@
+"""Tests for the inference backends."""
+
+from gpt_migrator.inference.backends import OllamaBackend, VLLMBackend
+
+
+def _conversation():
+    return {
+        "messages": [
+            {"role": "system", "content": "sys"},
+            {"role": "developer", "content": "# Instructions\nBe terse."},
+            {"role": "user", "content": "hello"},
+        ]
+    }
+
+
+def test_ollama_prompt_conversion():
+    prompt = OllamaBackend()._convert_to_prompt(_conversation())
+    assert prompt.startswith("System: sys")
+    assert "User: hello" in prompt
+    assert prompt.endswith("Assistant:")
+
+
+def test_vllm_message_conversion():
+    messages = VLLMBackend()._convert_to_messages(_conversation())
+    assert [m["role"] for m in messages] == ["system", "user", "user"]
+    assert messages[2]["content"] == "hello"
+
+
+def test_conversion_accepts_builder_conversations():
+    # HarmonyBuilder shares its system message as a read-only mapping
+    # proxy; conversion must not assume every message is a plain dict.
+    from gpt_migrator.harmony.harmony_builder import HarmonyBuilder
+
+    conversation = HarmonyBuilder().build_conversation(
+        [{"role": "user", "content": "hello"}]
+    )
+    prompt = OllamaBackend()._convert_to_prompt(conversation)
+    assert "User: hello" in prompt
+    messages = VLLMBackend()._convert_to_messages(conversation)
+    assert messages[-1] == {"role": "user", "content": "hello"}
+
+
+def test_local_inference_generate_times_backend_call():
+    from gpt_migrator.inference.inference import LocalInference
+
+    class _FakeBackend:
+        def generate(self, conversation):
+            return "ok"
+
+    inference = LocalInference(backend=_FakeBackend())
+    result = inference.generate(_conversation())
+    assert result["response"] == "ok"
+    assert result["response_time"] >= 0
+    assert result["model"] == "gpt-oss-20b"
+
+
+def test_local_inference_rejects_invalid_conversation():
+    import pytest
+
+    from gpt_migrator.inference.inference import LocalInference
+
+    inference = LocalInference(backend=object())
+    with pytest.raises(ValueError):
+        inference.generate({"messages": [{"content": "no role"}]})
+
+
+def test_encoded_payload_matches_full_serialization():
+    import orjson
+
+    for backend in (OllamaBackend(), VLLMBackend()):
+        encoded = orjson.loads(backend._encode_payload(_conversation()))
+        assert encoded == backend._build_payload(_conversation())
+
+
+def test_request_compression_is_opt_in():
+    import gzip
+
+    from gpt_migrator.inference.backends import _prepare_body
+
+    payload = b'{"prompt":"' + b"x" * 8192 + b'"}'
+
+    # Default: stock Ollama/vLLM servers don't decompress request
+    # bodies, so even large payloads must go out as plain JSON.
+    plain, plain_headers = _prepare_body(payload)
+    assert plain == payload
+    assert "Content-Encoding" not in plain_headers
+    assert OllamaBackend().compress_requests is False
+    assert VLLMBackend().compress_requests is False
+
+    # Opted in: large bodies gzip, small ones still skip the overhead.
+    small, small_headers = _prepare_body(b"{}", compress=True)
+    assert small == b"{}"
+    assert "Content-Encoding" not in small_headers
+
+    big, big_headers = _prepare_body(payload, compress=True)
+    assert big_headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(big) == payload
+
+
+def test_model_info_cached_behind_ttl():
+    backend = OllamaBackend()
+    fetches = []
+    backend._fetch_model_info = lambda: fetches.append(1) or {"name": "m"}
+    assert backend.get_model_info() == {"name": "m"}
+    assert backend.get_model_info() == {"name": "m"}
+    assert len(fetches) == 1
+
+
+def test_response_cache_serves_repeat_conversations():
+    from gpt_migrator.inference.cache import ResponseCache
+    from gpt_migrator.inference.inference import LocalInference
+
+    class _CountingBackend:
+        calls = 0
+
+        def generate(self, conversation):
+            self.calls += 1
+            return "ok"
+
+    backend = _CountingBackend()
+    inference = LocalInference(backend=backend, cache=ResponseCache())
+    first = inference.generate(_conversation())
+    second = inference.generate(_conversation())
+    assert backend.calls == 1
+    assert second["response"] == first["response"] == "ok"
+
+
+def test_cache_key_handles_builder_conversations():
+    from gpt_migrator.harmony.harmony_builder import HarmonyBuilder
+    from gpt_migrator.inference.cache import ResponseCache
+
+    builder = HarmonyBuilder()
+    conversation = builder.build_conversation(
+        [{"role": "user", "content": "hello"}]
+    )
+    key = ResponseCache.make_key("m", conversation)
+    assert key == ResponseCache.make_key("m", conversation)
+    other = builder.build_conversation([{"role": "user", "content": "bye"}])
+    assert key != ResponseCache.make_key("m", other)
+
+
+def test_response_cache_expires_entries():
+    from gpt_migrator.inference.cache import ResponseCache
+
+    cache = ResponseCache(ttl=-1)  # everything already expired
+    key = ResponseCache.make_key("m", {"messages": []})
+    cache.set(key, {"response": "x"})
+    assert cache.get(key) is None
+
+
+def test_batching_backend_coalesces_concurrent_calls():
+    import asyncio
+
+    from gpt_migrator.inference.backends import BatchingVLLMBackend
+
+    batcher = BatchingVLLMBackend(batch_window_ms=1.0)
+    batch_sizes = []
+
+    async def fake_post_batch(prompts):
+        batch_sizes.append(len(prompts))
+        return [f"reply to {p.count('<|start|>')}" for p in prompts]
+
+    batcher._post_batch = fake_post_batch
+
+    async def run():
+        conversations = [
+            {"messages": [{"role": "user", "content": f"q{i}"}]}
+            for i in range(5)
+        ]
+        return await asyncio.gather(
+            *(batcher.agenerate(c) for c in conversations)
+        )
+
+    results = asyncio.run(run())
+    assert len(results) == 5
+    assert batch_sizes == [5]
+
+
+def test_async_clients_rebind_across_event_loops():
+    import asyncio
+
+    from gpt_migrator.inference.inference import AsyncLocalInference
+
+    backend = OllamaBackend()
+    inference = AsyncLocalInference()
+
+    async def grab():
+        return backend.aclient, inference.client
+
+    first_aclient, first_client = asyncio.run(grab())
+    second_aclient, second_client = asyncio.run(grab())
+    assert first_aclient is not second_aclient
+    assert first_client is not second_client
+
+    async def same_loop_reuses():
+        return backend.aclient is backend.aclient and (
+            inference.client is inference.client
+        )
+
+    assert asyncio.run(same_loop_reuses())
+
+
+def test_batching_backend_flushes_items_arriving_mid_batch():
+    import asyncio
+
+    from gpt_migrator.inference.backends import BatchingVLLMBackend
+
+    batcher = BatchingVLLMBackend(batch_window_ms=1.0)
+    batch_sizes = []
+
+    async def slow_post_batch(prompts):
+        batch_sizes.append(len(prompts))
+        await asyncio.sleep(0.05)
+        return ["r"] * len(prompts)
+
+    batcher._post_batch = slow_post_batch
+
+    async def run():
+        first = asyncio.ensure_future(
+            batcher.agenerate({"messages": [{"role": "user", "content": "a"}]})
+        )
+        # Let the first batch get into its (slow) POST, then enqueue a
+        # second request while it is in flight.
+        await asyncio.sleep(0.02)
+        second = batcher.agenerate(
+            {"messages": [{"role": "user", "content": "b"}]}
+        )
+        return await asyncio.wait_for(
+            asyncio.gather(first, second), timeout=2.0
+        )
+
+    results = asyncio.run(run())
+    assert results == ["r", "r"]
+    assert batch_sizes == [1, 1]
+
+
+def test_backends_share_a_pooled_session():
+    first = OllamaBackend()
+    second = VLLMBackend()
+    assert first._session is second._session
+    assert first._session.get_adapter("http://localhost:11434") is (
+        first._session.get_adapter("http://other-host:9999")
+    )
+    first.close()
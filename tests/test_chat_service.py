@@ -0,0 +1,148 @@
+"""Tests for the chat service's token splicing and tool loop."""
+
+import pytest
+
+from openai_harmony import Message, ReasoningEffort, Role
+
+from gpt_migrator.chat import chat_service
+from gpt_migrator.chat.chat_service import (
+    CODE_INSTRUCTIONS,
+    CREATIVE_INSTRUCTIONS,
+    HELPFUL_INSTRUCTIONS,
+    ChatService,
+)
+
+
+class _FakeEncoding:
+    """Deterministic stand-in for the Harmony encoding.
+
+    Tokens are character codes; each rendered message is wrapped in
+    marker tokens, so sentinel search and prefix splicing behave like
+    the real tokenizer without downloading a vocabulary.
+    """
+
+    START, END, ASSISTANT_START = 100000, 100001, 100002
+
+    def encode(self, text):
+        return [ord(c) for c in text]
+
+    @staticmethod
+    def _text(message):
+        part = message.content[0]
+        return getattr(part, "text", None) or str(part)
+
+    def render(self, message):
+        return [self.START] + self.encode(self._text(message)) + [self.END]
+
+    def render_conversation(self, conversation):
+        tokens = []
+        for message in conversation.messages:
+            tokens += self.render(message)
+        return tokens
+
+    def render_conversation_for_completion(self, conversation, role):
+        return self.render_conversation(conversation) + [self.ASSISTANT_START]
+
+
+class _ScriptedInference:
+    """Fake inference returning pre-parsed replies and recording tokens."""
+
+    def __init__(self, replies=()):
+        self.replies = list(replies)
+        self.calls = []
+
+    def generate_with_tokens(self, tokens):
+        self.calls.append(list(tokens))
+        return self.replies.pop(0)
+
+
+def _final(text):
+    return Message.from_role_and_content(Role.ASSISTANT, text).with_channel(
+        "final"
+    )
+
+
+@pytest.fixture()
+def service(monkeypatch):
+    monkeypatch.setattr(
+        chat_service, "load_harmony_encoding", lambda name: _FakeEncoding()
+    )
+    monkeypatch.setattr(
+        chat_service, "LocalInference", lambda **kw: _ScriptedInference()
+    )
+    monkeypatch.setattr(
+        chat_service, "AsyncLocalInference", lambda **kw: _ScriptedInference()
+    )
+    return ChatService()
+
+
+def test_spliced_render_matches_full_render(service):
+    # The static-prefix + user-turn + assistant-start splice must produce
+    # exactly the tokens of a full conversation render for every flow.
+    for effort, instructions in (
+        (ReasoningEffort.LOW, HELPFUL_INSTRUCTIONS),
+        (ReasoningEffort.HIGH, CREATIVE_INSTRUCTIONS),
+        (ReasoningEffort.MEDIUM, CODE_INSTRUCTIONS),
+    ):
+        full = service.encoding.render_conversation_for_completion(
+            service._build_conversation("hello world", effort, instructions),
+            Role.ASSISTANT,
+        )
+        spliced = service._render_request("hello world", effort, instructions)
+        assert spliced == full
+
+
+def test_simple_chat_returns_final_channel_text(service):
+    analysis = Message.from_role_and_content(
+        Role.ASSISTANT, "thinking"
+    ).with_channel("analysis")
+    service.inference = _ScriptedInference([[analysis, _final("answer")]])
+    assert service.simple_chat("hi") == "answer"
+
+
+def test_chat_turn_extends_history_incrementally(service):
+    inference = _ScriptedInference([[_final("one")], [_final("two")]])
+    service.inference = inference
+
+    assert service.chat_turn("first", reset=True) == "one"
+    assert service.chat_turn("second") == "two"
+
+    # The second request replays the first turn's tokens (minus the
+    # assistant-start suffix) rather than re-rendering from scratch.
+    history = inference.calls[0][: -len(service._assistant_start_tokens)]
+    assert inference.calls[1][: len(history)] == history
+
+
+def test_run_with_tools_hands_parsed_json_to_tools(service):
+    call = (
+        Message.from_role_and_content(Role.ASSISTANT, '{"expression": "2+2"}')
+        .with_channel("commentary")
+        .with_recipient("calc")
+    )
+    service.inference = _ScriptedInference([[call], [_final("4")]])
+
+    seen = []
+
+    def calc(arguments):
+        seen.append(arguments)
+        return "4"
+
+    assert service.run_with_tools("what is 2+2?", {"calc": calc}) == "4"
+    assert seen == [{"expression": "2+2"}]
+
+
+def test_run_with_tools_reports_unknown_tool(service):
+    call = (
+        Message.from_role_and_content(Role.ASSISTANT, "{}")
+        .with_channel("commentary")
+        .with_recipient("missing")
+    )
+    service.inference = _ScriptedInference([[call], [_final("done")]])
+    assert service.run_with_tools("hi", {}) == "done"
+    # The unknown-tool result is rendered back into the second request.
+    continuation = service.inference.calls[1]
+    rendered_error = service.encoding.encode("Unknown tool: missing")
+    assert any(
+        continuation[i:i + len(rendered_error)] == rendered_error
+        for i in range(len(continuation))
+    )
@@ -0,0 +1,63 @@
+"""Tests for the configuration module."""
+
+from gpt_migrator.core.config import Config, _load_toml
+
+
+def test_defaults():
+    config = Config()
+    assert config.model == "gpt-oss-20b"
+    assert config.get_backend_url() == "http://localhost:11434"
+    assert config.validate_config() == []
+
+
+def test_load_from_file_is_cached(tmp_path):
+    path = tmp_path / "gpt-migrator.toml"
+    path.write_text('model = "gpt-oss-120b"\n\n[inference]\nvllm_host = "http://gpu:8000"\n')
+    _load_toml.cache_clear()
+    config = Config.load_from_file(path)
+    assert config.model == "gpt-oss-120b"
+    assert config.inference.vllm_host == "http://gpu:8000"
+    Config.load_from_file(path)
+    assert _load_toml.cache_info().hits == 1
+
+
+def test_reload_after_edit(tmp_path):
+    path = tmp_path / "gpt-migrator.toml"
+    path.write_text('backend = "ollama"\n')
+    assert Config.load_from_file(path).backend == "ollama"
+    path.write_text('backend = "vllm"\n')
+    import os
+
+    os.utime(path, (0, 0))  # force a distinct mtime
+    assert Config.load_from_file(path).backend == "vllm"
+
+
+def test_load_from_env(monkeypatch):
+    monkeypatch.setenv("GPT_MIGRATOR_MODEL", "gpt-oss-120b")
+    monkeypatch.setenv("OLLAMA_HOST", "http://box:11434")
+    config = Config.load_from_env()
+    assert config.model == "gpt-oss-120b"
+    assert config.inference.ollama_host == "http://box:11434"
+
+
+def test_save_round_trips(tmp_path):
+    path = tmp_path / "out.toml"
+    original = Config(model="gpt-oss-120b", backend="vllm")
+    original.save_to_file(path)
+    assert Config.load_from_file(path) == original
+
+
+def test_config_is_frozen_and_caches_backend_url():
+    import pytest
+    from pydantic import ValidationError
+
+    config = Config(backend="vllm")
+    assert config.get_backend_url() == "http://localhost:8000"
+    assert config.validate_config() is config.validate_config()
+    with pytest.raises(ValidationError):
+        config.backend = "ollama"
+
+
+def test_validate_config_reports_errors():
+    errors = Config(backend="modal", reasoning_effort="max").validate_config()
+    assert len(errors) == 2
@@ -0,0 +1,82 @@
+"""Tests for the converter module."""
+
+import ast
+
+from gpt_migrator.converter.converter import (
+    Converter,
+    ConverterConfig,
+    TargetModel,
+)
+from gpt_migrator.scanner.scanner import APICall
+
+
+def _call(**overrides):
+    defaults = {"file": "app.py", "line": 10, "type": "chat"}
+    defaults.update(overrides)
+    return APICall(**defaults)
+
+
+def test_convert_chat_call():
+    result = Converter()._convert_single_call(_call())
+    assert result.success
+    assert "load_harmony_encoding" in result.converted_code
+    assert 'model="gpt-oss-20b"' in result.converted_code
+
+
+def test_convert_uses_configured_model():
+    converter = Converter(ConverterConfig(model=TargetModel.GPT_OSS_120B))
+    result = converter._convert_single_call(_call())
+    assert 'model="gpt-oss-120b"' in result.converted_code
+
+
+def test_convert_embedding_unsupported():
+    result = Converter()._convert_single_call(_call(type="embedding"))
+    assert not result.success
+    assert result.notes
+
+
+def test_convert_complex_chat_includes_tools():
+    conversation = {
+        "messages": [
+            {"role": "system", "content": "You are a weather expert."},
+            {"role": "user", "content": "What's the weather like?"},
+        ],
+        "functions": [
+            {"name": "get_weather", "description": "Get the weather"},
+        ],
+    }
+    result = Converter()._convert_single_call(
+        _call(complexity="complex"), conversation
+    )
+    assert result.success
+    assert "ToolNamespaceConfig" in result.converted_code
+    assert "get_weather" in result.converted_code
+
+
+def test_generated_code_is_valid_python():
+    # Message content is embedded via repr, so even hostile content
+    # (quotes, backslashes, newlines) must yield parseable source.
+    conversation = {
+        "messages": [
+            {"role": "system", "content": 'Use """quotes""" \\ carefully'},
+            {"role": "user", "content": "line one\nline two '\"'"},
+        ],
+    }
+    result = Converter()._convert_single_call(_call(), conversation)
+    ast.parse(result.converted_code)
+
+
+def test_convert_calls_preserves_order():
+    calls = [_call(line=i) for i in range(20)]
+    results = Converter().convert_calls(calls)
+    assert [r.line for r in results] == list(range(20))
+
+
+def test_convert_calls_streams_to_sink():
+    calls = [_call(line=i) for i in range(5)] + [_call(type="embedding")]
+    seen = []
+    summary = Converter().convert_calls(calls, sink=seen.append)
+    assert summary.total == 6
+    assert summary.converted == 5
+    assert summary.unsupported == 1
+    assert len(seen) == 6
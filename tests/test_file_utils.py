@@ -0,0 +1,135 @@
+"""Tests for the filesystem helpers."""
+
+from gpt_migrator.utils import (
+    backup_file,
+    restore_file,
+    write_converted_code,
+    write_converted_code_batch,
+)
+
+
+def test_backup_and_restore_round_trip(tmp_path):
+    source = tmp_path / "app.py"
+    source.write_text("original")
+
+    backup = backup_file(source)
+    assert backup.read_text() == "original"
+
+    source.write_text("mangled")
+    assert restore_file(source)
+    assert source.read_text() == "original"
+
+
+def test_hardlink_backup_survives_the_atomic_write_path(tmp_path):
+    import os
+
+    source = tmp_path / "app.py"
+    source.write_text("original")
+    backup = backup_file(source, hardlink=True)
+
+    assert os.path.samestat(os.stat(source), os.stat(backup))
+    # Restoring while still linked must not truncate the shared inode.
+    assert restore_file(source)
+    assert source.read_text() == "original"
+
+    # The atomic write path replaces the source inode, leaving the
+    # backup's content intact.
+    write_converted_code(source, "mangled", preserve_backup=False)
+    assert backup.read_text() == "original"
+    assert restore_file(source)
+    assert source.read_text() == "original"
+
+
+def test_backup_skips_copy_when_source_unchanged(tmp_path, monkeypatch):
+    import pytest
+
+    from gpt_migrator.utils import file_utils
+
+    source = tmp_path / "app.py"
+    source.write_text("original")
+    backup_file(source)
+
+    monkeypatch.setattr(
+        file_utils, "_fast_copy",
+        lambda *a: pytest.fail("copied an unchanged file"),
+    )
+    assert backup_file(source).read_text() == "original"
+
+
+def test_backup_preserves_mode_and_mtime(tmp_path):
+    import os
+
+    source = tmp_path / "run.sh"
+    source.write_text("#!/bin/sh")
+    os.chmod(source, 0o755)
+
+    backup = backup_file(source)
+    src_stat = os.stat(source)
+    bak_stat = os.stat(backup)
+    assert bak_stat.st_mtime_ns == src_stat.st_mtime_ns
+    assert bak_stat.st_mode == src_stat.st_mode
+
+
+def test_restore_without_backup_returns_false(tmp_path):
+    source = tmp_path / "app.py"
+    source.write_text("x")
+    assert restore_file(source) is False
+
+
+def test_write_converted_code_backs_up_in_place_target(tmp_path):
+    target = tmp_path / "app.py"
+    target.write_text("old")
+
+    out = write_converted_code(target, "new")
+    assert out == target
+    assert target.read_text() == "new"
+    assert (tmp_path / "app.py.backup").read_text() == "old"
+
+
+def test_write_converted_code_into_output_dir(tmp_path):
+    target = tmp_path / "app.py"
+    target.write_text("old")
+
+    out = write_converted_code(target, "new", output_dir=tmp_path / "out")
+    assert out == tmp_path / "out" / "app.py"
+    assert out.read_text() == "new"
+    assert target.read_text() == "old"
+
+
+def test_write_converted_code_batch_preserves_order(tmp_path):
+    items = [
+        (tmp_path / "pkg" / f"mod_{i}.py", f"code {i}") for i in range(8)
+    ]
+    written = write_converted_code_batch(items, preserve_backup=False)
+    assert written == [target for target, _ in items]
+    for target, code in items:
+        assert target.read_text() == code
+
+
+def test_write_converted_code_batch_empty():
+    assert write_converted_code_batch([]) == []
+
+
+def test_write_converted_code_keeps_target_permissions(tmp_path):
+    import os
+    import stat
+
+    target = tmp_path / "run.sh"
+    target.write_text("#!/bin/sh")
+    os.chmod(target, 0o755)
+
+    write_converted_code(target, "#!/bin/sh\necho new", preserve_backup=False)
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o755
+
+    fresh = tmp_path / "fresh.py"
+    write_converted_code(fresh, "x = 1", preserve_backup=False)
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(fresh).st_mode) == 0o666 & ~umask
+
+
+def test_write_converted_code_leaves_no_temp_files(tmp_path):
+    target = tmp_path / "app.py"
+    write_converted_code(target, "données: héllo", preserve_backup=False)
+    assert target.read_text(encoding="utf-8") == "données: héllo"
+    assert [p.name for p in tmp_path.iterdir()] == ["app.py"]
@@ -0,0 +1,118 @@
+"""Tests for the git helpers."""
+
+import subprocess
+
+import pytest
+
+from gpt_migrator.utils import get_git_status, get_repo_info, is_git_repo
+
+
+def _init_repo(path):
+    def git(*args):
+        subprocess.run(
+            ["git", "-C", str(path), "-c", "user.email=dev@example.com",
+             "-c", "user.name=dev", *args],
+            check=True, capture_output=True,
+        )
+
+    subprocess.run(
+        ["git", "init", "-q", "-b", "main", str(path)],
+        check=True, capture_output=True,
+    )
+    git("commit", "--allow-empty", "-m", "initial")
+    git("remote", "add", "origin", "https://example.com/repo.git")
+    return git
+
+
+@pytest.fixture()
+def repo(tmp_path):
+    _init_repo(tmp_path)
+    return tmp_path
+
+
+def test_is_git_repo(tmp_path, repo):
+    assert is_git_repo(repo)
+    assert not is_git_repo(tmp_path / "nowhere")
+
+
+def test_is_git_repo_does_not_cache_misses(tmp_path):
+    target = tmp_path / "later"
+    target.mkdir()
+    assert not is_git_repo(target)
+
+    _init_repo(target)
+    assert is_git_repo(target)
+
+
+def test_get_repo_info_reads_git_dir_directly(repo, monkeypatch):
+    from gpt_migrator.utils import git_utils
+
+    monkeypatch.setattr(
+        git_utils, "_git",
+        lambda *a: pytest.fail("fell back to subprocess"),
+    )
+    info = get_repo_info(repo)
+    assert info["branch"] == "main"
+    assert info["remote_url"] == "https://example.com/repo.git"
+    assert len(info["commit"]) == 40
+
+
+def test_get_git_status_single_invocation(repo):
+    status = get_git_status(repo)
+    assert status["branch"] == "main"
+    assert status["clean"]
+
+    (repo / "new.py").write_text("x")
+    subprocess.run(
+        ["git", "-C", str(repo), "add", "new.py"],
+        check=True, capture_output=True,
+    )
+    status = get_git_status(repo)
+    assert status["changes"] == ["new.py"]
+    assert not status["clean"]
+
+
+def test_get_git_status_cached_until_git_dir_changes(repo, monkeypatch):
+    from gpt_migrator.utils import git_utils
+
+    calls = []
+    real_git = git_utils._git
+    monkeypatch.setattr(
+        git_utils, "_git",
+        lambda *args: calls.append(args) or real_git(*args),
+    )
+    first = get_git_status(repo)
+    second = get_git_status(repo)
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_resolve_ref_reuses_one_session(repo, monkeypatch):
+    from gpt_migrator.utils import git_utils
+
+    spawned = []
+    real_popen = subprocess.Popen
+    monkeypatch.setattr(
+        git_utils.subprocess, "Popen",
+        lambda *a, **kw: spawned.append(a) or real_popen(*a, **kw),
+    )
+    first = git_utils.resolve_ref(repo, "HEAD")
+    second = git_utils.resolve_ref(repo, "HEAD")
+    assert first == second
+    assert len(first) == 40
+    assert len(spawned) == 1
+    assert git_utils.resolve_ref(repo, "refs/heads/nope") is None
+
+
+def test_clone_repo_defaults_to_shallow_filtered(repo, tmp_path):
+    from gpt_migrator.utils import clone_repo
+
+    target = tmp_path / "clone"
+    assert clone_repo(str(repo), target)
+    assert (target / ".git").exists()
+
+    log = subprocess.run(
+        ["git", "-C", str(target), "rev-list", "--count", "HEAD"],
+        check=True, capture_output=True, text=True,
+    )
+    assert log.stdout.strip() == "1"
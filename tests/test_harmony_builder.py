@@ -0,0 +1,96 @@
+"""Tests for the Harmony builder module."""
+
+from gpt_migrator.harmony.harmony_builder import HarmonyBuilder, ReasoningEffort
+
+
+def test_build_conversation_prepends_system_message():
+    conv = HarmonyBuilder().build_conversation(
+        [{"role": "user", "content": "hi"}]
+    )
+    assert conv["messages"][0]["role"] == "system"
+    assert "Reasoning: medium" in conv["messages"][0]["content"]
+    assert conv["messages"][1] == {"role": "user", "content": "hi"}
+
+
+def test_system_prompt_cached_per_effort():
+    builder = HarmonyBuilder()
+    first = builder._build_system_content(ReasoningEffort.HIGH)
+    assert builder._build_system_content(ReasoningEffort.HIGH) is first
+    assert "Reasoning: high" in first
+
+
+def test_system_message_is_shared_flyweight():
+    builder = HarmonyBuilder()
+    first = builder.build_conversation([{"role": "user", "content": "a"}])
+    second = builder.build_completion_conversation("b")
+    assert first["messages"][0] is second["messages"][0]
+
+
+def test_openai_system_message_becomes_developer():
+    conv = HarmonyBuilder().build_conversation(
+        [{"role": "system", "content": "Be terse."}]
+    )
+    assert conv["messages"][1]["role"] == "developer"
+    assert "# Instructions" in conv["messages"][1]["content"]
+
+
+def test_generate_harmony_prompt_format():
+    builder = HarmonyBuilder()
+    conv = builder.build_completion_conversation("hello")
+    prompt = builder.generate_harmony_prompt(conv)
+    assert "<|start|>user<|message|>hello<|end|>" in prompt
+    assert prompt.endswith("<|start|>assistant\n")
+
+
+def test_prompt_serializer_reused_per_role_shape():
+    from gpt_migrator.harmony.harmony_builder import _SERIALIZER_CACHE
+
+    builder = HarmonyBuilder()
+    conv = builder.build_conversation([{"role": "user", "content": "one"}])
+    builder.generate_harmony_prompt(conv)
+    roles = tuple(m["role"] for m in conv["messages"])
+    cached = _SERIALIZER_CACHE[roles]
+    conv2 = builder.build_conversation([{"role": "user", "content": "two"}])
+    prompt = builder.generate_harmony_prompt(conv2)
+    assert _SERIALIZER_CACHE[roles] is cached
+    assert "<|start|>user<|message|>two<|end|>" in prompt
+
+
+def test_prompt_bytes_matches_str_rendering():
+    builder = HarmonyBuilder()
+    conv = builder.build_conversation(
+        [{"role": "user", "content": "héllo ✨"}]
+    )
+    assert builder.generate_harmony_prompt_bytes(conv) == (
+        builder.generate_harmony_prompt(conv).encode()
+    )
+
+
+def test_conversation_with_tools_extends_developer_message():
+    builder = HarmonyBuilder()
+    conv = builder.build_conversation_with_tools(
+        [{"role": "system", "content": "Weather expert."}],
+        [{"name": "get_weather", "description": "Get the weather"}],
+    )
+    developer = conv["messages"][1]
+    assert developer["role"] == "developer"
+    assert "namespace functions" in developer["content"]
+    assert "get_weather" in developer["content"]
+
+
+def test_validate_conversation_reports_errors():
+    builder = HarmonyBuilder()
+    assert builder.validate_conversation({}) == [
+        "Conversation has no 'messages' key"
+    ]
+    errors = builder.validate_conversation(
+        {"messages": [{"role": "wizard", "content": "hi"}]}
+    )
+    assert any("unknown role" in e for e in errors)
+    assert any("no system message" in e for e in errors)
+
+
+def test_validate_conversation_accepts_built_conversation():
+    builder = HarmonyBuilder()
+    conv = builder.build_conversation([{"role": "user", "content": "hi"}])
+    assert builder.validate_conversation(conv) == []
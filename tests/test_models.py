@@ -0,0 +1,64 @@
+"""Tests for the core carrier models."""
+
+import orjson
+import pytest
+from pydantic import ValidationError
+
+from gpt_migrator.core.models import MigrationReport, ScanResult
+from gpt_migrator.scanner.scanner import APICall
+
+
+class _Result:
+    def __init__(self, success):
+        self.success = success
+
+
+def test_scan_result_is_slotted():
+    result = ScanResult(calls=[APICall(file="a.py", line=1, type="chat")])
+    assert not hasattr(result, "__dict__")
+    assert result.files_scanned == 0
+
+
+def test_migration_report_from_results():
+    report = MigrationReport.from_results(
+        [_Result(True), _Result(True), _Result(False)]
+    )
+    assert report.total_calls == 3
+    assert report.successful_conversions == 2
+    assert report.failed_conversions == 1
+    assert report.success_rate == pytest.approx(2 / 3)
+    assert report.summary["success_rate"] == "66.7%"
+    assert report.summary is report.summary  # cached on the frozen model
+
+
+def test_to_columnar_and_token_totals():
+    scan = ScanResult(calls=[
+        APICall(file="a.py", line=1, type="chat", estimated_tokens=100),
+        APICall(file="b.py", line=2, type="embedding"),
+        APICall(file="c.py", line=3, type="chat", estimated_tokens=50),
+    ])
+    columns = scan.to_columnar()
+    assert columns.files == ("a.py", "b.py", "c.py")
+    assert columns.types == ("chat", "embedding", "chat")
+    assert scan.total_estimated_tokens() == 150
+    assert ScanResult().to_columnar().lines == ()
+
+
+def test_to_json_round_trips():
+    scan = ScanResult(
+        calls=[APICall(file="a.py", line=1, type="chat")], files_scanned=1
+    )
+    data = orjson.loads(scan.to_json())
+    assert data["calls"][0]["type"] == "chat"
+
+    report = MigrationReport.from_results([_Result(True)])
+    data = orjson.loads(report.to_json())
+    assert data["successful_conversions"] == 1
+    assert "created_at" in data
+
+
+def test_migration_report_is_frozen():
+    report = MigrationReport.from_results([])
+    assert report.success_rate == 0.0
+    with pytest.raises(ValidationError):
+        report.total_calls = 5
@@ -0,0 +1,91 @@
+"""Tests for the scanner module."""
+
+from pathlib import Path
+
+from gpt_migrator.scanner.scanner import Scanner
+
+EXAMPLES_DIR = Path(__file__).parent.parent / "examples"
+
+
+def test_scan_file_detects_calls():
+    scanner = Scanner()
+    calls = scanner.scan_file(str(EXAMPLES_DIR / "sample_app.py"))
+    types = {call.type for call in calls}
+    assert {"chat", "completion", "embedding"} <= types
+
+
+def test_scan_directory_parallel_matches_serial():
+    parallel = Scanner().scan_directory(str(EXAMPLES_DIR), parallel=True)
+    serial = Scanner().scan_directory(str(EXAMPLES_DIR), parallel=False)
+
+    key = lambda call: (call.file, call.line, call.type)
+    assert sorted(map(key, parallel)) == sorted(map(key, serial))
+    assert parallel
+
+
+def test_scan_many_matches_serial_scan():
+    from gpt_migrator.scanner import scan_many
+
+    files = sorted(str(p) for p in EXAMPLES_DIR.glob("*.py"))
+    pooled = scan_many(files)
+    serial = Scanner().scan_directory(str(EXAMPLES_DIR), parallel=False)
+
+    key = lambda call: (call.file, call.line, call.type)
+    assert sorted(map(key, pooled)) == sorted(map(key, serial))
+
+
+def test_javascript_detector_finds_sdk_and_fetch_calls(tmp_path):
+    source = (
+        "const r = await openai.createChatCompletion({ messages });\n"
+        "const e = await openai.createEmbedding({ input });\n"
+        'fetch("https://api.openai.com/v1/completions");\n'
+    )
+    js_file = tmp_path / "app.js"
+    js_file.write_text(source)
+
+    calls = Scanner()._scan_file(str(js_file))
+    assert [(c.line, c.type) for c in calls] == [
+        (1, "chat"),
+        (2, "embedding"),
+        (3, "http"),
+    ]
+
+
+def test_ast_cache_skips_reparse(tmp_path, monkeypatch):
+    import ast
+
+    from gpt_migrator.scanner import _ast_cache
+
+    data = b"import openai\nopenai.ChatCompletion.create(model='gpt-4')\n"
+    first = _ast_cache.get_or_parse(data, tmp_path)
+    assert isinstance(first, ast.Module)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def boom(*args, **kwargs):
+        raise AssertionError("reparsed despite warm cache")
+
+    monkeypatch.setattr(ast, "parse", boom)
+    cached = _ast_cache.get_or_parse(data, tmp_path)
+    assert ast.dump(cached) == ast.dump(first)
+
+
+def test_scanner_uses_ast_cache_dir(tmp_path):
+    source = tmp_path / "app.py"
+    source.write_text("import openai\nopenai.Embedding.create(input='x')\n")
+    cache_dir = tmp_path / "cache"
+
+    calls = Scanner(ast_cache_dir=str(cache_dir))._scan_file(str(source))
+    assert [c.type for c in calls] == ["embedding"]
+    assert any(cache_dir.iterdir())
+
+
+def test_exclude_patterns_filter_walked_files(tmp_path):
+    (tmp_path / "keep.py").write_text("import openai\n")
+    (tmp_path / "skip_test.py").write_text("import openai\n")
+    sub = tmp_path / "generated"
+    sub.mkdir()
+    (sub / "model.py").write_text("import openai\n")
+
+    scanner = Scanner(exclude_patterns=["*_test.py", "generated/*"])
+    found = sorted(scanner._iter_source_files(str(tmp_path)))
+    assert found == [str(tmp_path / "keep.py")]
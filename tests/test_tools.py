@@ -0,0 +1,116 @@
+"""Tests for the tool registry."""
+
+import pytest
+
+from gpt_migrator.tools import BaseTool, ToolRegistry
+
+
+class _CountingTool(BaseTool):
+    name = "counter"
+    can_memoize = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, **kwargs):
+        self.calls += 1
+        return {"success": True, "result": self.calls}
+
+
+class _FailingTool(BaseTool):
+    name = "failing"
+    can_memoize = True
+
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, **kwargs):
+        self.calls += 1
+        return {"success": False, "error": "boom"}
+
+
+def test_calculator_executes_expressions():
+    registry = ToolRegistry()
+    assert registry.execute("calculator", expression="2 + 3")["result"] == 5
+
+
+def test_unknown_tool_raises():
+    with pytest.raises(ValueError):
+        ToolRegistry().execute("missing")
+
+
+def test_registering_a_tool_clears_its_negative_lookup():
+    registry = ToolRegistry(register_defaults=False)
+    with pytest.raises(ValueError):
+        registry.execute("counter")
+
+    registry.register(_CountingTool())
+    assert registry.execute("counter")["success"]
+
+
+def test_memoizable_tool_runs_once_per_argument_set():
+    registry = ToolRegistry(register_defaults=False)
+    tool = _CountingTool()
+    registry.register(tool)
+
+    first = registry.execute("counter", question="q")
+    second = registry.execute("counter", question="q")
+    assert first == second
+    assert tool.calls == 1
+
+    registry.execute("counter", question="other")
+    assert tool.calls == 2
+
+
+def test_error_results_are_not_cached():
+    registry = ToolRegistry(register_defaults=False)
+    tool = _FailingTool()
+    registry.register(tool)
+
+    registry.execute("failing")
+    registry.execute("failing")
+    assert tool.calls == 2
+
+
+def test_clear_memo_cache_forces_reexecution():
+    registry = ToolRegistry(register_defaults=False)
+    tool = _CountingTool()
+    registry.register(tool)
+
+    registry.execute("counter")
+    registry.clear_memo_cache()
+    registry.execute("counter")
+    assert tool.calls == 2
+
+
+def test_time_tool_is_not_memoized():
+    registry = ToolRegistry()
+    entry = registry._tools["time"]
+    assert entry.can_memoize is False
+
+
+def test_calculator_rejects_non_arithmetic_expressions():
+    registry = ToolRegistry()
+    result = registry.execute("calculator", expression="__import__('os')")
+    assert result["success"] is False
+
+    result = registry.execute("calculator", expression="'a' * 9999")
+    assert result["success"] is False
+
+
+def test_register_publishes_an_immutable_snapshot():
+    registry = ToolRegistry()
+    snapshot = registry._tools
+    with pytest.raises(TypeError):
+        snapshot["rogue"] = object()
+
+    registry.register(_CountingTool())
+    assert "counter" in registry._tools
+    assert "counter" not in snapshot
+
+
+def test_calculator_supports_whitelisted_functions():
+    registry = ToolRegistry()
+    assert registry.execute(
+        "calculator", expression="max(2, abs(-5))"
+    )["result"] == 5